@@ -4,48 +4,293 @@ consistent handling of passwords and tokens).
 """
 
 import functools
+import itertools
+import json
 import logging
 import netrc
 import os.path
+import tempfile
+import threading
+import time
 
-from appdirs import user_config_dir
 import click
-from github3 import login, GitHubError
-import yaml
 
 
 logging.basicConfig()
 LOGGER = logging.getLogger(__name__)
 
-CONFIG_DIR = user_config_dir('edx-repo-tools', 'edx')
-AUTH_CONFIG_FILE = os.path.join(CONFIG_DIR, 'auth.yaml')
-
 AUTHORIZATION_NOTE = 'edx-repo-tools'
 
+# When fewer than this many requests remain in the rate limit window, wait
+# for the window to reset rather than letting requests fail.
+RATE_LIMIT_THRESHOLD = 10
+
+# The most recent two-factor code, as a (code, captured_at) tuple.
 TWO_FACTOR_CODE = None
 
+# Two-factor codes are only valid for about 30 seconds, so prompt for a new
+# one rather than retrying with an expired code.
+TWO_FACTOR_CODE_TTL = 30
+
+# Logged-in GitHub instances, keyed by (username, token), so that every
+# pass_github command in a process shares one pooled session.
+_HUBS = {}
+
 
 def do_two_factor():
     """
     Capture two-factor auth input for use by the GitHub object.
     """
     global TWO_FACTOR_CODE  # pylint: disable=global-statement
-    if TWO_FACTOR_CODE is None:
-        TWO_FACTOR_CODE = input('Two-factor code: ')
+    if TWO_FACTOR_CODE is None or time.monotonic() - TWO_FACTOR_CODE[1] > TWO_FACTOR_CODE_TTL:
+        code = click.prompt('Two-factor code', hide_input=True)
+        TWO_FACTOR_CODE = (code, time.monotonic())
+
+    return TWO_FACTOR_CODE[0]
+
+
+@functools.cache
+def _config_paths():
+    """
+    Return the paths of the user config directory, the auth config file, and
+    the legacy YAML auth config file (which is migrated to the auth config
+    file the first time it is read).
+    """
+    from appdirs import user_config_dir  # pylint: disable=import-outside-toplevel
+
+    config_dir = user_config_dir('edx-repo-tools', 'edx')
+    return (
+        config_dir,
+        os.path.join(config_dir, 'auth.json'),
+        os.path.join(config_dir, 'auth.yaml'),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _read_auth_settings(mtime_ns):  # pylint: disable=unused-argument
+    """
+    Read the auth settings last modified at ``mtime_ns``.
+
+    ``mtime_ns`` is only used as the cache key, so that the file is re-read
+    when it changes.
+    """
+    _, auth_config_file, _ = _config_paths()
+    with open(auth_config_file) as auth_config:
+        return json.load(auth_config)
+
+
+def _write_auth_settings(auth_settings):
+    """
+    Store ``auth_settings`` in the auth config file.
+    """
+    config_dir, auth_config_file, _ = _config_paths()
+    os.makedirs(config_dir, exist_ok=True)
+
+    # Write to a uniquely named temporary file and swap it in, so that a
+    # failed write can't leave a truncated auth config file behind, and
+    # concurrent logins can't write into each other's temporary files.
+    fd, tmp_file = tempfile.mkstemp(dir=config_dir, prefix='auth.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as auth_config:
+            json.dump(auth_settings, auth_config)
+        os.replace(tmp_file, auth_config_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+    LOGGER.info(f"Wrote credentials to {auth_config_file!r}")
+
+
+def _migrate_legacy_auth_settings():
+    """
+    Rewrite the settings in the legacy YAML auth config file as JSON, and
+    remove the legacy file, so its plaintext token isn't left behind.
+    """
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    _, _, legacy_auth_config_file = _config_paths()
+    try:
+        with open(legacy_auth_config_file) as auth_config:
+            auth_settings = yaml.safe_load(auth_config) or {}
+    except yaml.YAMLError:
+        LOGGER.debug('Unable to migrate auth settings', exc_info=True)
+        return
+    LOGGER.info(f"Migrating auth from {legacy_auth_config_file!r}")
+    _write_auth_settings(auth_settings)
+    os.remove(legacy_auth_config_file)
+
+
+def _load_auth_settings():
+    """
+    Return the settings stored in the auth config file, or an empty dict if
+    they can't be read.
+    """
+    _, auth_config_file, legacy_auth_config_file = _config_paths()
+    try:
+        if not os.path.exists(auth_config_file) and os.path.exists(legacy_auth_config_file):
+            _migrate_legacy_auth_settings()
+        auth_settings = _read_auth_settings(os.stat(auth_config_file).st_mtime_ns)
+        LOGGER.info(f"Read auth from {auth_config_file!r}")
+    except FileNotFoundError:
+        # No stored settings yet, which is the common first-run case.
+        LOGGER.debug('No auth settings found')
+        auth_settings = {}
+    except (ValueError, OSError):
+        LOGGER.debug('Unable to load auth settings', exc_info=True)
+        auth_settings = {}
+    return auth_settings
+
+
+def _throttle(response, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    A requests response hook that sleeps until the rate limit resets when
+    the remaining budget drops below RATE_LIMIT_THRESHOLD.
+    """
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    reset = response.headers.get('X-RateLimit-Reset')
+    if remaining is None or reset is None:
+        return
+
+    if int(remaining) < RATE_LIMIT_THRESHOLD:
+        delay = int(reset) - time.time()
+        if delay > 0:
+            LOGGER.warning('Rate limit nearly exhausted, sleeping %d seconds', delay)
+            time.sleep(delay)
 
-    return TWO_FACTOR_CODE
+
+@functools.lru_cache(maxsize=1)
+def _read_netrc_authenticator(mtime_ns):  # pylint: disable=unused-argument
+    """
+    Return the ~/.netrc credentials for api.github.com, as last modified at
+    ``mtime_ns`` (which is only used as the cache key).
+    """
+    return netrc.netrc().authenticators("api.github.com")
+
+
+def _netrc_authenticator():
+    """
+    Return the ~/.netrc credentials for api.github.com, only re-parsing the
+    file when it changes. Raises OSError if there is no ~/.netrc.
+    """
+    mtime_ns = os.stat(os.path.expanduser('~/.netrc')).st_mtime_ns
+    return _read_netrc_authenticator(mtime_ns)
 
 
-def login_github(username=None, password=None, token=None, token_file=None):
+def _configure_session(session, throttle=True):
+    """
+    Mount a pooled, retrying HTTPAdapter for https:// on ``session``, and
+    (if ``throttle``) wait out the rate limit when it's nearly exhausted.
+    """
+    # pylint: disable=import-outside-toplevel
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            # Once retries run out, hand back the last response so github3
+            # can raise its own exception for it.
+            raise_on_status=False,
+        ),
+    ))
+    if throttle:
+        session.hooks['response'].append(_throttle)
+
+
+def _token_login(username, token):
+    """
+    Return a GitHub instance logged in as ``username`` with ``token``, reusing
+    one created earlier in this process if possible, or None if there aren't
+    enough credentials to log in.
+    """
+    from github3 import login  # pylint: disable=import-outside-toplevel
+
+    hub = _HUBS.get((username, token))
+    if hub is None:
+        hub = login(username, token)
+        if hub is None:
+            return None
+        _configure_session(hub.session)
+        _HUBS[(username, token)] = hub
+    return hub
+
+
+class RoundRobinTokenAuth:
+    """
+    A requests auth handler that spreads requests across several tokens.
+
+    Each request uses the next token in turn, unless another token reported
+    more rate limit remaining on its last response. Only when even that token
+    is nearly exhausted does it wait for a rate limit window to reset.
+
+    Because the token is chosen for every request, objects and iterators
+    returned by github3 keep spreading their requests (including pagination)
+    across the tokens too.
+    """
+    def __init__(self, tokens):
+        self._tokens = list(tokens)
+        self._cycle = itertools.cycle(self._tokens)
+        self._lock = threading.Lock()
+        # The last X-RateLimit-Remaining and X-RateLimit-Reset seen for each token.
+        self._remaining = {}
+        self._reset = {}
+
+    def _budget(self, token):
+        # Tokens that haven't made a request yet have their full budget.
+        return self._remaining.get(token, float('inf'))
+
+    def _next_token(self):
+        with self._lock:
+            token = next(self._cycle)
+            best = max(self._tokens, key=self._budget)
+            if self._budget(best) > self._budget(token):
+                token = best
+            if self._budget(token) < RATE_LIMIT_THRESHOLD:
+                # Every token is nearly exhausted, so use the first to reset.
+                token = min(self._tokens, key=lambda t: self._reset.get(t, 0))
+                delay = self._reset.get(token, 0) - time.time()
+                if delay > 0:
+                    LOGGER.warning('Rate limit nearly exhausted for every token, sleeping %d seconds', delay)
+                    time.sleep(delay)
+                # The window has reset, so the budget is unknown again.
+                del self._remaining[token]
+            return token
+
+    def _record_rate_limit(self, token, response, *args, **kwargs):  # pylint: disable=unused-argument
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            self._remaining[token] = int(remaining)
+            self._reset[token] = int(reset)
+
+    def __call__(self, request):
+        token = self._next_token()
+        request.headers['Authorization'] = f'token {token}'
+        request.register_hook('response', functools.partial(self._record_rate_limit, token))
+        return request
+
+
+def _read_tokens_file(tokens_file):
+    """
+    Return the non-blank lines of ``tokens_file``, stripped of whitespace.
+    """
+    with open(tokens_file) as tf:
+        return [line.strip() for line in tf if line.strip()]
+
+
+def login_github(username=None, password=None, token=None, token_file=None, tokens_file=None):
     """
     Log in to GitHub using the specified username, password, token, or
     token_file.
 
     The token_file is used preferentially, containing a personal access token.
-    If not specified, read from an auth.yaml file in the user settings
-    directory.  if that doesn't exist, read ~/.netrc.  If that doesn't exist,
-    prompt for username and password, create a token, and store it in the user
-    settings directory.
+    If not specified, read from an auth.json file (or a legacy auth.yaml file)
+    in the user settings directory.  if that doesn't exist, read ~/.netrc.  If
+    that doesn't exist, prompt for username and password, create a token, and
+    store it in the user settings directory.
 
     Arguments:
         username (string):
@@ -57,23 +302,31 @@ def login_github(username=None, password=None, token=None, token_file=None):
         token (string):
             The personal access token to log in with. If not specified, checks
             the AUTH_SETTINGS dictionary.
-        token_file (string):
-            File containing the personal access token to log in with. Overrides
-            token argument. File can be a named pipe (bash process
-            substitution) for increased security.
+        token_file (file or string):
+            Open file (or path to a file) containing the personal access token
+            to log in with. Overrides token argument. File can be a named pipe
+            (bash process substitution) for increased security.
+        tokens_file (string):
+            File containing several personal access tokens, one per line.
+            Overrides token and token_file arguments. Calls are spread across
+            all of the tokens, to get more out of the rate limit.
 
     Returns: (:class:`~github3.GitHub`)
-        A logged-in `~github3.GitHub` instance
+        A logged-in `~github3.GitHub` instance (spreading its requests across
+        the tokens with :class:`RoundRobinTokenAuth` when ``tokens_file``
+        holds more than one)
     """
+    # github3 is slow to import, so only pay for it when logging in.
+    from github3 import login, GitHubError  # pylint: disable=import-outside-toplevel
+
     hub = None
 
-    try:
-        with open(AUTH_CONFIG_FILE) as auth_config:
-            AUTH_SETTINGS = yaml.safe_load(auth_config)
-        LOGGER.info(f"Read auth from {AUTH_CONFIG_FILE!r}")
-    except:  # pylint: disable=bare-except
-        LOGGER.debug('Unable to load auth settings', exc_info=True)
+    if username is not None and (token, token_file, tokens_file) != (None, None, None):
+        # The arguments fully specify the credentials, so don't bother
+        # reading the stored ones.
         AUTH_SETTINGS = {}
+    else:
+        AUTH_SETTINGS = _load_auth_settings()
 
     if username is None:
         username = AUTH_SETTINGS.get('username')
@@ -81,36 +334,52 @@ def login_github(username=None, password=None, token=None, token_file=None):
     if token is None:
         token = AUTH_SETTINGS.get('token')
 
+    # Log in with each token from the tokens file, if it's supplied
+    if tokens_file is not None and username is not None:
+        tokens = _read_tokens_file(tokens_file)
+        if len(tokens) > 1:
+            hub = login(username, tokens[0])
+            # The auth handler does its own throttling, across all the tokens.
+            _configure_session(hub.session, throttle=False)
+            hub.session.auth = RoundRobinTokenAuth(tokens)
+        elif tokens:
+            hub = _token_login(username, tokens[0])
+        else:
+            LOGGER.warning("No tokens in file")
+
     # Log in with token from file, if it's supplied
-    if token_file is not None and username is not None:
-        with open(token_file) as tf:
-            token = tf.readline().strip()
-            if token:
-                hub = login(username, token)
-            else:
-                LOGGER.warn("No token in file")
+    elif token_file is not None and username is not None:
+        if isinstance(token_file, (str, os.PathLike)):
+            with open(token_file) as tf:
+                token = tf.readline().strip()
+        else:
+            token = token_file.readline().strip()
+        if token:
+            hub = _token_login(username, token)
+        else:
+            LOGGER.warning("No token in file")
 
     # Otherwise, fall back to password, if supplied
     elif password is not None and username == AUTH_SETTINGS.get('username'):
         hub = login(username, password, two_factor_callback=do_two_factor)
+        _configure_session(hub.session)
 
     # Otherwise, log in with the stored token
     elif username is not None and token is not None:
-        hub = login(username, token)
+        hub = _token_login(username, token)
 
     else:
         # Try .netrc
         try:
-            netrc_data = netrc.netrc()
+            authenticator = _netrc_authenticator()
         except OSError:
             # No .netrc file, that's fine.
             pass
         else:
             LOGGER.info("Read .netrc for auth")
-            authenticator = netrc_data.authenticators("api.github.com")
             if authenticator is not None:
                 username, _, token = authenticator
-            hub = login(username, token)
+            hub = _token_login(username, token)
 
     # If no password or token, prompt for a password
     # and generate a token, and then store the token
@@ -121,6 +390,7 @@ def login_github(username=None, password=None, token=None, token_file=None):
         password = click.prompt('Password', hide_input=True)
 
         hub = login(username, password, two_factor_callback=do_two_factor)
+        _configure_session(hub.session)
 
         try:
             token = hub.authorize(
@@ -134,10 +404,13 @@ def login_github(username=None, password=None, token=None, token_file=None):
 
             LOGGER.debug('Attempting to delete existing authorization')
 
-            authorizations = hub.authorizations()
-            for authorization in authorizations:
-                if authorization.note == AUTHORIZATION_NOTE:
-                    authorization.delete()
+            # Notes are unique per user, so stop at the first match.
+            existing = next(
+                (auth for auth in hub.authorizations() if auth.note == AUTHORIZATION_NOTE),
+                None,
+            )
+            if existing is not None:
+                existing.delete()
 
             token = hub.authorize(
                 login=username,
@@ -146,16 +419,10 @@ def login_github(username=None, password=None, token=None, token_file=None):
                 note=AUTHORIZATION_NOTE,
             )
 
-        if not os.path.exists(CONFIG_DIR):
-            os.makedirs(CONFIG_DIR)
-
-        # pylint: disable=redefined-outer-name
-        with open(AUTH_CONFIG_FILE, 'w') as auth_config:
-            yaml.safe_dump({
-                'username': username,
-                'token': token.token,
-            }, auth_config)
-            LOGGER.info(f"Wrote credentials to {AUTH_CONFIG_FILE!r}")
+        _write_auth_settings({
+            'username': username,
+            'token': token.token,
+        })
 
     hub.set_user_agent(AUTHORIZATION_NOTE)
 
@@ -164,6 +431,37 @@ def login_github(username=None, password=None, token=None, token_file=None):
     return hub
 
 
+# The click options added by pass_github, built once and shared by every
+# decorated command.
+_PASS_GITHUB_OPTIONS = (
+    click.option(
+        '--username',
+        help='Specify the user to log in to GitHub with',
+        envvar="GITHUB_USERNAME",
+    ),
+    click.option('--password', help='Password to log in to GitHub with'),
+    click.option(
+        '--token',
+        help='Personal access token to log in to GitHub with',
+        envvar="GITHUB_TOKEN",
+    ),
+    click.option(
+        '--token-file',
+        type=click.File('r'),
+        help='File containing personal access token to log in to GitHub with',
+    ),
+    click.option(
+        '--tokens-file',
+        help='File containing several personal access tokens (one per line) to spread requests across',
+    ),
+    click.option(
+        '--debug/--no-debug',
+        help='Enable debug logging',
+        default=False
+    ),
+)
+
+
 def pass_github(f):
     """
     A click decorator that passes a logged-in GitHub instance to a click
@@ -192,35 +490,16 @@ def pass_github(f):
     f._pass_github_applied = True
 
     # pylint: disable=missing-docstring
-    @click.option(
-        '--username',
-        help='Specify the user to log in to GitHub with',
-        envvar="GITHUB_USERNAME",
-    )
-    @click.option('--password', help='Password to log in to GitHub with')
-    @click.option(
-        '--token',
-        help='Personal access token to log in to GitHub with',
-        envvar="GITHUB_TOKEN",
-    )
-    @click.option(
-        '--token-file',
-        help='File containing personal access token to log in to GitHub with',
-    )
-    @click.option(
-        '--debug/--no-debug',
-        help='Enable debug logging',
-        default=False
-    )
     @functools.wraps(f)
-    def wrapped(username, password, token, token_file, debug, *args, **kwargs):
+    def wrapped(username, password, token, token_file, tokens_file, debug, *args, **kwargs):
 
         if debug:
             logging.basicConfig()
             logging.getLogger().setLevel(logging.DEBUG)
 
-        hub = login_github(username, password, token, token_file)
+        hub = login_github(username, password, token, token_file, tokens_file)
 
         f(hub=hub, *args, **kwargs)
 
-    return wrapped
+    # Apply the options bottom-up, as stacked decorators would be.
+    return functools.reduce(lambda func, option: option(func), reversed(_PASS_GITHUB_OPTIONS), wrapped)
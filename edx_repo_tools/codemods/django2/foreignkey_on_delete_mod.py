@@ -6,15 +6,6 @@ from fissix.pytree import Node, Leaf
 from lib2to3.fixer_util import Name, KeywordArg, Dot, Comma, Newline, ArgList
 
 
-def filter_print_string(node, capture, filename) -> bool:
-    function_name = capture.get("function_name")
-    from pprint import pprint
-
-    pprint(node)
-    pprint(capture)
-    return True
-
-
 def filter_has_no_on_delete(node: LN, capture: Capture, filename: Filename) -> bool:
     arguments = capture.get("function_arguments")[0].children
     for arg in arguments:
@@ -41,16 +32,13 @@ def add_on_delete_cascade(
     return node
 
 
+# Both selectors share one query, so each file is only parsed once.
 (
     Query(sys.argv[1])
     .select_method("ForeignKey")
     .is_call()
     .filter(filter_has_no_on_delete)
     .modify(add_on_delete_cascade)
-    .idiff()
-),
-(
-    Query(sys.argv[1])
     .select_method("OneToOneField")
     .is_call()
     .filter(filter_has_no_on_delete)
@@ -4,8 +4,9 @@ Codemod to add new settings in the repo settings file.
 import json
 import re
 import os
+from pathlib import Path
+
 import click
-from copy import deepcopy
 
 
 class SettingsModernizer:
@@ -18,24 +19,42 @@ class SettingsModernizer:
     NEW_AUTO_FIELD = "django.db.models.AutoField"
     NEW_PROCESSOR = "django.template.context_processors.request"
 
+    # Built once from the keys above, rather than on every update.
+    HASH_ALGORITHM_REGEX = re.compile(DEFAULT_ALGORITHM_KEY + r"\s=\s'[a-zA-Z0-9]*'\n")
+    AUTO_FIELD_REGEX = re.compile(DEFAULT_FIELD_KEY + r"\s=\s'([a-zA-Z](.[a-zA-Z])?)*'\n")
+    CONTEXT_PROCESSORS_REGEX = re.compile(r"'context_processors': \(([^)]*)\)")
+
     def __init__(self, setting_path, is_service):
         self.settings_path = setting_path
         self.is_service = is_service
 
-    def _apply_regex_operations(self, matching_pattern, new_pattern, context_processors=False):
-        file_data = open(self.settings_path).read()
+    def _apply_regex_operations(self, matching_pattern, new_pattern, context_processors=False, key=None):
+        file_data = Path(self.settings_path).read_text(encoding='utf-8')
+        # Plain substring checks are much cheaper than running the regex, and
+        # most settings files don't contain the setting at all.
         if context_processors:
-            if self.NEW_PROCESSOR not in file_data and re.search("context_processors", file_data):
-                file_data = re.sub(pattern=matching_pattern, repl=new_pattern, string=file_data)
+            if self.NEW_PROCESSOR not in file_data and "context_processors" in file_data:
+                file_data = matching_pattern.sub(new_pattern, file_data)
         else:
-            file_data = re.sub(pattern=matching_pattern, repl="", string=file_data)
-            file_data = file_data+new_pattern
-        return deepcopy(file_data)
+            replaced = False
+            if key is None or key in file_data:
+                # Replace the first existing setting in place (dropping any
+                # repeats) in a single pass over the file.
+                def replace_setting(match):
+                    nonlocal replaced
+                    if replaced:
+                        return ""
+                    replaced = True
+                    return new_pattern
+
+                file_data = matching_pattern.sub(replace_setting, file_data)
+            if not replaced:
+                file_data = file_data+new_pattern
+        return file_data
 
-    def _update_settings_file(self, matching_pattern, new_pattern, context_processors=False):
-        file_data = self._apply_regex_operations(matching_pattern, new_pattern, context_processors)
-        with open(self.settings_path, 'w') as setting_file:
-            setting_file.write(file_data)
+    def _update_settings_file(self, matching_pattern, new_pattern, context_processors=False, key=None):
+        file_data = self._apply_regex_operations(matching_pattern, new_pattern, context_processors, key)
+        Path(self.settings_path).write_text(file_data, encoding='utf-8')
 
     def update_settings(self):
         if self.is_service:
@@ -47,25 +66,22 @@ class SettingsModernizer:
         """
         Update the HASHING_ALGORITHM in the settings file.
         """
-        matching_algorithm = f"{self.DEFAULT_ALGORITHM_KEY}\s=\s'[a-zA-Z0-9]*'\\n"
         new_algorithm = f"{self.DEFAULT_ALGORITHM_KEY} = '{self.NEW_HASHING_ALGORITHM}'\n"
-        self._update_settings_file(matching_algorithm, new_algorithm)
+        self._update_settings_file(self.HASH_ALGORITHM_REGEX, new_algorithm, key=self.DEFAULT_ALGORITHM_KEY)
 
     def update_auto_field(self):
         """
         Update the AUTO_FIELD in the settings file.
         """
-        matching_field = f"{self.DEFAULT_FIELD_KEY}\s=\s'([a-zA-Z](.[a-zA-Z])?)*'\\n"
         new_field = f"{self.DEFAULT_FIELD_KEY} = '{self.NEW_AUTO_FIELD}'\n"
-        self._update_settings_file(matching_field, new_field)
+        self._update_settings_file(self.AUTO_FIELD_REGEX, new_field, key=self.DEFAULT_FIELD_KEY)
 
     def update_context_processors(self):
         """
         Update the CONTEXT_PROCESSORS in the settings file.
         """
-        matching_pattern = fr"'context_processors': \(([^)]*)\)"
         new_pattern = fr"'context_processors': (\1" + f"\t'{self.NEW_PROCESSOR}',\n\t\t\t\t)"
-        self._update_settings_file(matching_pattern, new_pattern, context_processors=True)
+        self._update_settings_file(self.CONTEXT_PROCESSORS_REGEX, new_pattern, context_processors=True)
 
 
 @click.command()
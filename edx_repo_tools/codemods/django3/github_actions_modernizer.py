@@ -1,48 +1,49 @@
 """
 Modernizer for Github Actions CI
 """
-from copy import deepcopy
-
 import click
 
 from edx_repo_tools.utils import YamlLoader
 
 TO_BE_REMOVED_PYTHON = ['3.5', '3.6']
+TO_BE_REMOVED_PYTHON_SET = frozenset(TO_BE_REMOVED_PYTHON)
 ALLOWED_PYTHON_VERSIONS = ['3.7', '3.8', 'py38']
+ALLOWED_PYTHON_VERSIONS_SET = frozenset(ALLOWED_PYTHON_VERSIONS)
 
 
 class GithubCIModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
     def _update_matrix(self):
 
-        python_versions = list()
-        matrix_elements = dict()
-        section_key = None
+        python_versions = []
+        matrix = None
 
         for key in ['build', 'tests', 'run_tests', 'run_quality', 'pytest']:
             if key in self.elements['jobs']:
-                section_key = key
-                matrix_elements = deepcopy(self.elements['jobs'][section_key]['strategy']['matrix'])
+                matrix = self.elements['jobs'][key]['strategy']['matrix']
 
-        for key, value in matrix_elements.items():
+        if matrix is None:
+            return
+
+        # Keys may be deleted from the matrix as we go, so iterate over a snapshot of its items.
+        for key, value in list(matrix.items()):
             if key == 'python-version':
-                python_versions.extend(filter(
-                    lambda version: version in ALLOWED_PYTHON_VERSIONS, value))
+                python_versions = [version for version in value if version in ALLOWED_PYTHON_VERSIONS_SET]
             elif key in ['include', 'exclude']:
-                without_python35 = list()
-                for item in value:
-                    if item['python-version'] not in TO_BE_REMOVED_PYTHON:
-                        without_python35.append(item)
+                without_python35 = [
+                    item for item in value if item['python-version'] not in TO_BE_REMOVED_PYTHON_SET
+                ]
 
-                if len(without_python35):
-                    self.elements['jobs'][section_key]['strategy']['matrix'][key] = without_python35
+                if without_python35:
+                    matrix[key] = without_python35
                 else:
-                    del self.elements['jobs'][section_key]['strategy']['matrix'][key]
-        if not section_key:
-            return
-        self.elements['jobs'][section_key]['strategy']['matrix']['python-version'] = python_versions
+                    del matrix[key]
+        matrix['python-version'] = python_versions
+        self._dirty = True
 
     def _update_python_versions(self):
         self._update_matrix()
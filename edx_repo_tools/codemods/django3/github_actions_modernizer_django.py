@@ -2,18 +2,21 @@
 Django Matrix Modernizer for Github Actions CI
 """
 import re
-from copy import deepcopy
 
 import click
 
 from edx_repo_tools.utils import YamlLoader
 
 DJANGO_ENV_PATTERN = r"django[0-3][0-2]?"
+DJANGO_ENV_REGEX = re.compile(DJANGO_ENV_PATTERN)
 ALLOWED_DJANGO_ENVS = ['django32', 'django40']
 ALLOWED_DJANGO_VERSIONS = ['3.2', '4.0']
+CODECOV_ACTIONS = frozenset({'codecov/codecov-action@v1', 'codecov/codecov-action@v2'})
 
 
 class GithubCIDjangoModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
@@ -22,15 +25,21 @@ class GithubCIDjangoModernizer(YamlLoader):
         if not isinstance(matrix_item, list):
             return
         if not matrix_item_name in MATRIX_INCLUDE_EXCLUDE_SECTION:
-            has_django_env = any(
-                re.match(DJANGO_ENV_PATTERN, item) for item in matrix_item
-            )
+            has_django_env = False
+            non_django_matrix_items = []
+            for item in matrix_item:
+                if DJANGO_ENV_REGEX.match(item):
+                    has_django_env = True
+                else:
+                    non_django_matrix_items.append(item)
             if not has_django_env:
                 return
-            non_django_matrix_items = [
-                item for item in matrix_item if not re.match(DJANGO_ENV_PATTERN, item)]
             updated_matrix_items = non_django_matrix_items + ALLOWED_DJANGO_ENVS
-            self.elements['jobs'][job_name]['strategy']['matrix'][matrix_item_name] = updated_matrix_items
+            if updated_matrix_items == matrix_item:
+                return
+            matrix = self.elements['jobs'][job_name]['strategy']['matrix']
+            matrix[matrix_item_name] = updated_matrix_items
+            self._dirty = True
         else:
             self._update_matrix_include_exclude_sections(
                 job_name, matrix_item_name, matrix_item)
@@ -38,38 +47,43 @@ class GithubCIDjangoModernizer(YamlLoader):
     def _update_matrix_include_exclude_sections(self, job_name, matrix_item_name, matrix_item):
         if not matrix_item_name in ['include', 'exclude']:
             return
-        section_items = deepcopy(matrix_item)
-        for item in section_items:
-            item_index = self.elements['jobs'][job_name]['strategy']['matrix'][matrix_item_name].index(item)
-            if ('django-version' in item) and (not item['django-version'] in ALLOWED_DJANGO_VERSIONS):
-                del self.elements['jobs'][job_name]['strategy']['matrix'][matrix_item_name][item_index]
-            elif (('toxenv' in item) and (not item['toxenv'] in ALLOWED_DJANGO_ENVS) and
-                  (item['toxenv'].find('django') != -1)):
-                del self.elements['jobs'][job_name]['strategy']['matrix'][matrix_item_name][item_index]
+        kept_items = [item for item in matrix_item if self._keep_matrix_section_item(item)]
+        if len(kept_items) == len(matrix_item):
+            return
+        self.elements['jobs'][job_name]['strategy']['matrix'][matrix_item_name] = kept_items
+        self._dirty = True
+
+    @staticmethod
+    def _keep_matrix_section_item(item):
+        if ('django-version' in item) and (not item['django-version'] in ALLOWED_DJANGO_VERSIONS):
+            return False
+        if (('toxenv' in item) and (not item['toxenv'] in ALLOWED_DJANGO_ENVS) and
+                (item['toxenv'].find('django') != -1)):
+            return False
+        return True
 
     def _update_django_matrix_items(self, job_name, job):
         matrices = job.get('strategy').get('matrix').items()
         for matrix_item_key, matrix_item in matrices:
             self._update_matrix_items(job_name, matrix_item_key, matrix_item)
 
-    def _update_codecov_check(self, job_name, step):
-        step_elements = deepcopy(step)
-        if not 'uses' in step_elements:
+    def _update_codecov_check(self, job_name, step_index, step):
+        if step.get('uses') not in CODECOV_ACTIONS:
             return
-        if not (step_elements['uses']) in ['codecov/codecov-action@v1', 'codecov/codecov-action@v2']:
+        if 'if' not in step:
             return
-        if not 'if' in step_elements:
+        django_32_string = step['if'].replace('django22', 'django32')
+        if django_32_string == step['if']:
             return
-        step_index = self.elements['jobs'][job_name]['steps'].index(step)
-        django_32_string = step_elements['if'].replace('django22', 'django32')
         self.elements['jobs'][job_name]['steps'][step_index]['if'] = django_32_string
+        self._dirty = True
 
     def _update_job_steps(self, job_name, job):
         steps = job.get('steps')
         if not steps:
             return
-        for step in steps:
-            self._update_codecov_check(job_name, step)
+        for step_index, step in enumerate(steps):
+            self._update_codecov_check(job_name, step_index, step)
 
     def _update_job(self):
         for job_name, job in self.elements.get('jobs').items():
@@ -5,6 +5,8 @@ import sys
 import click
 from bowler import Query
 
+from edx_repo_tools.utils import files_containing, iter_python_files, map_in_processes
+
 
 def remove_node(node, _, __):
     """
@@ -17,8 +19,16 @@ def run_removal_query(path):
     """
     Run the bowler query on the input files for refactoring.
     """
+    file_paths = files_containing(iter_python_files(path), b"python_2_unicode_compatible")
+    map_in_processes(_run_removal_query_on_file, file_paths)
+
+
+def _run_removal_query_on_file(file_path):
+    """
+    Run the bowler query on a single file.
+    """
     (
-        Query(path)
+        Query(file_path)
         .select("decorator<'@' name='python_2_unicode_compatible' any>")
         .modify(remove_node)
         .select("import_from<'from' module_name=any 'import' 'python_2_unicode_compatible'>")
@@ -4,6 +4,8 @@ from typing import Optional
 
 from bowler import Query, LN, Capture, Filename
 
+from edx_repo_tools.utils import files_containing, iter_python_files, map_in_processes
+
 DJANGO_SHORTCUT_FILES = []
 
 
@@ -33,9 +35,12 @@ def add_request_param(node: LN, capture: Capture, filename: Filename) -> Optiona
     return node
 
 
-def main():
+def replace_render_to_response(file_path):
+    """
+    Run the bowler query on a single file.
+    """
     (
-        Query(sys.argv[1])
+        Query(file_path)
             .select_function("render_to_response")
             .filter(filter_render_function)
             .rename('render')
@@ -44,5 +49,17 @@ def main():
     )
 
 
+def run_replacement_query(path):
+    """
+    Run the bowler query on the input files for refactoring.
+    """
+    file_paths = files_containing(iter_python_files(path), b"render_to_response")
+    map_in_processes(replace_render_to_response, file_paths)
+
+
+def main():
+    run_replacement_query(sys.argv[1])
+
+
 if __name__ == '__main__':
     main()
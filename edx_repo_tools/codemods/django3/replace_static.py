@@ -1,18 +1,41 @@
 import click
-import subprocess
+
+from edx_repo_tools.utils import iter_files
+
+# The tags are plain text, so str.replace is enough; no need for a regex.
+STATIC_LOAD_TAG_REPLACEMENTS = {
+    '{% load staticfiles %}': '{% load static %}',
+    '{% load admin_static %}': '{% load static %}',
+}
+
+
+def replace_static(path):
+    """
+    Replace the deprecated staticfiles and admin_static template tag libraries
+    with static in every .html file under the path.
+    """
+    for file_path in iter_files(path, '.html'):
+        with open(file_path) as file_stream:
+            file_data = file_stream.read()
+        updated_file_data = file_data
+        for old_tag, new_tag in STATIC_LOAD_TAG_REPLACEMENTS.items():
+            updated_file_data = updated_file_data.replace(old_tag, new_tag)
+        if updated_file_data != file_data:
+            print(f"Replacing in {file_path}")
+            with open(file_path, 'w') as file_stream:
+                file_stream.write(updated_file_data)
 
 
 @click.command()
-@click.option('--path', help='use syntax: --path {path_to_input_file/directory}')
+@click.option('--path', required=True, help='use syntax: --path {path_to_input_file/directory}')
 def main(path):
     """
     Function to handle input path for refactoring.
     HOW_TO_USE: when running as a repo tool, use following syntax to run the command:
         replace_staticfiles --path {path_to_input_file/directory}
     """
-    subprocess.run(['./edx_repo_tools/codemods/django3/script_to_replace_static.sh', path])
+    replace_static(path)
 
 
 if __name__ == '__main__':
     main()
-
@@ -3,19 +3,21 @@ import sys
 import click
 from bowler import Query
 
+from edx_repo_tools.utils import files_containing, iter_python_files
+
 
 def replace_unicode(path):
     """
     Run the bowler query on the input files for refactoring.
     """
+    file_paths = list(files_containing(iter_python_files(path), b"__unicode__"))
+    if not file_paths:
+        return
+    # Both selectors share one query, so each file is only parsed once.
     (
-        Query(path)
+        Query(*file_paths)
         .select_function("__unicode__")
         .rename('__str__')
-        .idiff()
-    ),
-    (
-        Query(path)
         .select_method("__unicode__")
         .is_call()
         .rename('__str__')
@@ -4,7 +4,7 @@ Codemod to modernize setup file.
 import json
 import os
 import re
-from copy import deepcopy
+from pathlib import Path
 
 import click
 
@@ -14,8 +14,9 @@ class SetupFileModernizer:
     """
     Django32 modernizer for updating setup files.
     """
-    old_classifiers_regex = r"(?!\s\s+'Framework :: Django :: 3.2')(\s\s+'Framework\s+::\s+Django\s+::\s+[0-3]+\.[0-2]+',)"
-    most_recent_classifier_regex = r"\s\s'Framework :: Django :: 3.2',\n"
+    django_classifier_regex = re.compile(r"\s*'Framework\s+::\s+Django\s+::\s+([0-3]+\.[0-2]+)',")
+    most_recent_django_version = '3.2'
+    most_recent_classifier_regex = re.compile(r"\s\s'Framework :: Django :: 3.2',\n")
     # Keep the new classifiers in descending order i.e Framework :: Django :: 4.1 then Framework :: Django :: 4.0 so they are sorted in the file
     new_trove_classifiers = ["'Framework :: Django :: 4.0',\n"]
 
@@ -23,28 +24,40 @@ class SetupFileModernizer:
         self.setup_file_path = path
 
     def _update_classifiers(self) -> None:
-        file_data = open(self.setup_file_path).read()
+        file_data = Path(self.setup_file_path).read_text(encoding='utf-8')
         file_data = self._remove_outdated_classifiers(file_data)
         file_data = self._add_new_classifiers(file_data)
         self._write_data_to_file(file_data)
 
     def _remove_outdated_classifiers(self, file_data) -> str:
-        modified_file_data = re.sub(self.old_classifiers_regex, '', file_data)
-        return modified_file_data
+        # The regex allows any whitespace around "::", so only gate on a word
+        # that every Django classifier contains.
+        if 'Framework' not in file_data:
+            return file_data
+        kept_lines = []
+        for line in file_data.splitlines(keepends=True):
+            if 'Framework' in line:
+                match = self.django_classifier_regex.match(line)
+                if match and match.group(1) != self.most_recent_django_version:
+                    continue
+            kept_lines.append(line)
+        return ''.join(kept_lines)
 
     def _add_new_classifiers(self, file_data) -> str:
-        res = re.search(self.most_recent_classifier_regex, file_data)
+        res = self.most_recent_classifier_regex.search(file_data)
         end_index_of_most_recent_classifier = res.end()
-        modified_file_data = file_data
-        for classifier in self.new_trove_classifiers:
-            modified_file_data = (modified_file_data[:end_index_of_most_recent_classifier] +
-                                  classifier.rjust(len(classifier)+TROVE_CLASSIFIERS_INDENT_COUNT) +
-                                  modified_file_data[end_index_of_most_recent_classifier:])
-        return modified_file_data
+        # Each classifier used to be spliced in at the same index, so the last
+        # one ends up first; keep that order.
+        new_classifiers = "".join(
+            classifier.rjust(len(classifier)+TROVE_CLASSIFIERS_INDENT_COUNT)
+            for classifier in reversed(self.new_trove_classifiers)
+        )
+        return (file_data[:end_index_of_most_recent_classifier] +
+                new_classifiers +
+                file_data[end_index_of_most_recent_classifier:])
 
     def _write_data_to_file(self, file_data) -> None:
-        with open(self.setup_file_path, 'w') as setup_file:
-            setup_file.write(file_data)
+        Path(self.setup_file_path).write_text(file_data, encoding='utf-8')
 
     def update_setup_file(self) -> None:
         self._update_classifiers()
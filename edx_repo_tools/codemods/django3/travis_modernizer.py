@@ -16,6 +16,8 @@ ALLOWED_DJANGO_VERSIONS = ['django22', 'django30', 'django31', 'django32']
 
 
 class TravisModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
@@ -24,6 +26,7 @@ class TravisModernizer(YamlLoader):
         if python_versions is None:
             return
         self.elements['python'] = [ALLOWED_PYTHON_VERSIONS]
+        self._dirty = True
 
     def _update_matrix_python_versions(self):
         matrix_elements = self.elements.get("matrix", {}).get("include")
@@ -43,6 +46,7 @@ class TravisModernizer(YamlLoader):
             python_matrix_items.append(python_matrix_item)
             break
         self.elements["matrix"]["include"] = non_python_matrix_elements + python_matrix_items
+        self._dirty = True
 
     @staticmethod
     def _get_updated_django_matrix_items(django_matrix_item):
@@ -73,6 +77,7 @@ class TravisModernizer(YamlLoader):
         non_django_env_items = [env_item for env_item in env_elements
                                 if not re.search(DJANGO_PATTERN, env_item)]
         self.elements["env"] = non_django_env_items + TravisModernizer._get_updated_django_envs(django_env_item)
+        self._dirty = True
 
     def _update_django_matrix_envs(self):
         matrix_items = self.elements.get("matrix", {}).get("include", [])
@@ -87,6 +92,7 @@ class TravisModernizer(YamlLoader):
                                    if not re.search(DJANGO_PATTERN, matrix_item.get("env", ""))]
         self.elements["matrix"]["include"] = (non_django_matrix_items +
                                               TravisModernizer._get_updated_django_matrix_items(django_matrix_element))
+        self._dirty = True
 
     def _update_python_versions(self):
         self._update_python_dict()
@@ -1,7 +1,6 @@
 """
 Modernizer for Github Actions CI Django 4.2 support
 """
-from copy import deepcopy
 import click
 from edx_repo_tools.utils import YamlLoader
 
@@ -9,28 +8,29 @@ ALLOWED_DJANGO_VERSIONS = ['django32', 'django42']
 
 
 class GithubCIModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
     def _update_django_in_matrix(self):
-        django_versions = list()
-        matrix_elements = dict()
-        section_key = None
+        matrix = None
 
         for key in ['build', 'tests', 'run_tests', 'run_quality', 'pytest']:
             if key in self.elements['jobs']:
-                section_key = key
-                matrix_elements = deepcopy(self.elements['jobs'][section_key]['strategy']['matrix'])
-
-        for key, value in matrix_elements.items():
-            if key == 'django-version':
-                django_versions = value
-                django_versions.extend(filter(
-                    lambda version: version not in value, ALLOWED_DJANGO_VERSIONS))
-        if not section_key:
+                matrix = self.elements['jobs'][key]['strategy']['matrix']
+
+        if matrix is None:
             return
+        # The matrix is updated in place, so there is no need to work on a copy of it.
+        django_versions = matrix.get('django-version')
         if django_versions:
-            self.elements['jobs'][section_key]['strategy']['matrix']['django-version'] = django_versions
+            existing_versions = set(django_versions)
+            missing_versions = [
+                version for version in ALLOWED_DJANGO_VERSIONS if version not in existing_versions]
+            if missing_versions:
+                django_versions.extend(missing_versions)
+                self._dirty = True
 
     def _update_github_actions(self):
         self._update_django_in_matrix()
@@ -1,36 +1,44 @@
-import os
 import re
 import click
 
+from edx_repo_tools.utils import iter_python_files
+
+# Regex pattern to match the lines containing providing_args
+PROVIDING_ARGS_REGEX = re.compile(r"[,\s]*providing_args\s*=\s*\[[^\]]*\]")
+
+
 def remove_providing_args(root_dir):
-    # Regex pattern to match the lines containing providing_args
-    pattern = r"(.*)[,\s]*providing_args\s*=\s*\[.*?\](.*)"
-
-    # Traverse all Python files in the root directory
-    for root, _, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith(".py"):
-                file_path = os.path.join(root, file)
-                updated_lines = []
-
-                # Open the file and read its content
-                with open(file_path, "r") as f:
-                    lines = f.readlines()
-
-                    # Process each line in the file
-                    for line in lines:
-                        # Check if the line contains providing_args
-                        match = re.match(pattern, line)
-                        if match:
-                            # Remove the providing_args argument along with any preceding comma or whitespace
-                            updated_line = match.group(1).rstrip(", \t") + match.group(2) + "\n"
-                            updated_lines.append(updated_line)
-                        else:
-                            updated_lines.append(line)
-
-                # Write the updated content back to the file
-                with open(file_path, "w") as f:
-                    f.writelines(updated_lines)
+    # Traverse all Python files in the root directory, skipping vendored and VCS directories
+    for file_path in iter_python_files(root_dir):
+        updated_lines = []
+        changed = False
+
+        # Open the file and read its content
+        with open(file_path, "r") as f:
+            data = f.read()
+
+        # Most files never mention providing_args, so skip them before splitting lines
+        if "providing_args" not in data:
+            continue
+
+        # Process each line in the file
+        for line in data.splitlines(keepends=True):
+            # Check if the line contains providing_args
+            match = "providing_args" in line and PROVIDING_ARGS_REGEX.search(line)
+            if match:
+                # Remove the providing_args argument along with any preceding comma or whitespace
+                updated_line = line[:match.start()].rstrip(", \t") + line[match.end():]
+                if not updated_line.endswith("\n"):
+                    updated_line += "\n"
+                updated_lines.append(updated_line)
+                changed = True
+            else:
+                updated_lines.append(line)
+
+        # Write the updated content back to the file, leaving untouched files alone
+        if changed:
+            with open(file_path, "w") as f:
+                f.writelines(updated_lines)
 
 
 @click.command()
@@ -43,4 +51,4 @@ def main(root_dir):
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
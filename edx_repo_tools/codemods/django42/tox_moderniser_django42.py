@@ -17,10 +17,13 @@ NEW_DJANGO_DEPENDENCIES = DJANGO_42_DEPENDENCY
 SECTIONS = [TOX_SECTION, TEST_ENV_SECTION]
 
 PYTHON_PATTERN = "(py{.*?}-?|py[0-9]+,|py[0-9]+-)"
+PYTHON_REGEX = re.compile(PYTHON_PATTERN)
 
 DJANGO_PATTERN = "(django[0-9]+,|django[0-9]+\n|django{.*}\n|django{.*?}|django[0-9]+-|django{.*}-)"
+DJANGO_REGEX = re.compile(DJANGO_PATTERN)
 
 DJANGO4_DEPENDENCY_PATTERN = "(django32:.*\n)"
+DJANGO4_DEPENDENCY_REGEX = re.compile(DJANGO4_DEPENDENCY_PATTERN)
 
 
 class ConfigReader:
@@ -54,56 +57,61 @@ class ToxModernizer:
         tox_section = self.config_parser[TOX_SECTION]
         env_list = tox_section[ENVLIST]
 
-        env_list = ToxModernizer._replace_runners(PYTHON_PATTERN, PYTHON_SUBSTITUTE, env_list)
-        env_list = ToxModernizer._replace_runners(DJANGO_PATTERN, DJANGO_SUBSTITUTE, env_list)
+        env_list = ToxModernizer._replace_runners(PYTHON_REGEX, PYTHON_SUBSTITUTE, env_list)
+        env_list = ToxModernizer._replace_runners(DJANGO_REGEX, DJANGO_SUBSTITUTE, env_list)
         self.config_parser[TOX_SECTION][ENVLIST] = env_list
 
     @staticmethod
     def _replace_runners(pattern, substitute, env_list):
-        matches = re.findall(pattern, env_list)
+        matches = list(pattern.finditer(env_list))
         if not matches:
             return env_list
         substitute = ToxModernizer._get_runner_substitute(matches, substitute)
-        return ToxModernizer._replace_matches(pattern, substitute, env_list, matches)
+        return ToxModernizer._replace_matches(substitute, env_list, matches)
 
     @staticmethod
-    def _replace_matches(pattern, substitute, target, matches):
+    def _replace_matches(substitute, target, matches):
         if not matches:
             return target
-        occurrences_to_replace = len(matches) - 1
-        if occurrences_to_replace > 0:
-            target = re.sub(pattern, '', target, occurrences_to_replace)
-
         # checking if there is any dependency for django32 dont override it
-        if matches[0].startswith('django32:'):
-            substitute = matches[0]
+        if matches[0].group().startswith('django32:'):
+            substitute = matches[0].group()
             if 'django42:' not in target:
                 substitute += DJANGO_42_DEPENDENCY
-        target = re.sub(pattern, substitute, target)
-        return target
+        # Splice the text between the matches back together, dropping every
+        # match but the last, which becomes the substitute.
+        pieces = []
+        previous_end = 0
+        for match in matches:
+            pieces.append(target[previous_end:match.start()])
+            previous_end = match.end()
+        pieces.append(substitute)
+        pieces.append(target[previous_end:])
+        return ''.join(pieces)
 
     @staticmethod
     def _get_runner_substitute(matches, substitute):
-        last_match = matches[-1]
+        last_match = matches[-1].group()
         has_other_runners = last_match.endswith('-')
         return substitute + "-" if has_other_runners else substitute
 
     def _replace_django_versions(self):
         test_environment = self.config_parser[TEST_ENV_SECTION]
         dependencies = test_environment[TEST_ENV_DEPS]
-        matches = re.findall(DJANGO4_DEPENDENCY_PATTERN, dependencies)
-        dependencies = self._replace_matches(DJANGO4_DEPENDENCY_PATTERN, NEW_DJANGO_DEPENDENCIES, dependencies, matches)
+        matches = list(DJANGO4_DEPENDENCY_REGEX.finditer(dependencies))
+        dependencies = self._replace_matches(NEW_DJANGO_DEPENDENCIES, dependencies, matches)
 
         self.config_parser[TEST_ENV_SECTION][TEST_ENV_DEPS] = dependencies
 
     def _update_config_file(self):
         # ConfigParser insists on using tabs for output. We want spaces.
+        # Fix them up a line at a time rather than copying the whole buffer.
         with io.StringIO() as configw:
             self.config_parser.write(configw)
-            new_ini = configw.getvalue()
-        new_ini = new_ini.replace("\t", "    ")
-        with open(self.file_path, 'w') as configfile:
-            configfile.write(new_ini)
+            configw.seek(0)
+            with open(self.file_path, 'w') as configfile:
+                for line in configw:
+                    configfile.write(line.replace("\t", "    "))
 
     def modernize(self):
         self._update_env_list()
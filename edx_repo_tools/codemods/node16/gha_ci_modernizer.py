@@ -2,7 +2,6 @@
 Node Modernizer for Github Actions CI
 """
 import click
-from copy import deepcopy
 
 from edx_repo_tools.utils import YamlLoader
 
@@ -11,18 +10,24 @@ ALLOWED_NPM_VERSION = '8.x.x'
 
 
 class GithubCiNodeModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
     def _add_new_matrix(self, job_name):
         self.elements['jobs'][job_name]['strategy'] = {'matrix': {'node': ALLOWED_NODE_VERSIONS}}
+        self._dirty = True
         self.elements['jobs'][job_name].move_to_end('strategy', last=False)
         self.elements['jobs'][job_name].move_to_end('runs-on', last=False)
         if 'name' in self.elements['jobs'][job_name]:
             self.elements['jobs'][job_name].move_to_end('name', last=False)
 
     def _update_existing_matrix(self, job_name):
-        self.elements['jobs'][job_name]['strategy']['matrix']['node'] = ALLOWED_NODE_VERSIONS
+        matrix = self.elements['jobs'][job_name]['strategy']['matrix']
+        if matrix.get('node') != ALLOWED_NODE_VERSIONS:
+            matrix['node'] = ALLOWED_NODE_VERSIONS
+            self._dirty = True
 
     def _update_strategy_matrix(self, job_name):
         if 'strategy' in self.elements['jobs'][job_name] and 'matrix' in self.elements['jobs'][job_name]['strategy']:
@@ -30,28 +35,33 @@ class GithubCiNodeModernizer(YamlLoader):
         else:
             self._add_new_matrix(job_name)
 
-    def _update_node_version(self, job_name, step):
-        step_index = self.elements['jobs'][job_name]['steps'].index(step)
-        self.elements['jobs'][job_name]['steps'][step_index]['with']['node-version'] = '${{ matrix.node }}'
+    def _update_node_version(self, job_name, step_index):
+        step_with = self.elements['jobs'][job_name]['steps'][step_index]['with']
+        if step_with.get('node-version') != '${{ matrix.node }}':
+            step_with['node-version'] = '${{ matrix.node }}'
+            self._dirty = True
 
-    def _update_npm_version(self, job_name, step):
-        step_index = self.elements['jobs'][job_name]['steps'].index(step)
-        self.elements['jobs'][job_name]['steps'][step_index]['run'] = 'npm i -g npm@'+ALLOWED_NPM_VERSION
+    def _update_npm_version(self, job_name, step_index):
+        step = self.elements['jobs'][job_name]['steps'][step_index]
+        if step.get('run') != 'npm i -g npm@'+ALLOWED_NPM_VERSION:
+            step['run'] = 'npm i -g npm@'+ALLOWED_NPM_VERSION
+            self._dirty = True
 
     def _update_job_steps(self, job_name, job):
         steps = job.get('steps')
         if not steps:
             return
-        for step in steps:
+        for step_index, step in enumerate(steps):
             if 'name' in step and step['name'] == 'Setup Nodejs':
-                self._update_node_version(job_name, step)
+                self._update_node_version(job_name, step_index)
             elif 'name' in step and step['name'] == 'Setup npm':
-                self._update_npm_version(job_name, step)
+                self._update_npm_version(job_name, step_index)
 
     def _update_job_name(self, job_name, job):
-        self.elements['jobs']['tests'] = deepcopy(job)
+        self.elements['jobs']['tests'] = job
         self.elements['jobs'].move_to_end('tests', last=False)
         self.elements['jobs'].pop(job_name)
+        self._dirty = True
 
     def _update_job(self):
         jobs = self.elements.get('jobs')
@@ -3,7 +3,7 @@ Node modernizer for Github CI release workflow
 """
 
 from copy import deepcopy
-from os.path import exists
+from functools import cached_property
 from pathlib import Path
 
 import click
@@ -14,53 +14,53 @@ from edx_repo_tools.utils import YamlLoader
 NODE_RELEASE_VERSION = 16
 NODE_JS_SETUP_ACTION_LIST = ['actions/setup-node@v2', 'actions/setup-node@v1']
 FETCH_NODE_VERSION_STEP = """name: 'Setup Nodejs Env'\nrun: 'echo "NODE_VER=`cat .nvmrc`" >> $GITHUB_ENV'\n"""
+# Parsed once; each insertion gets its own copy so the inserted steps don't share nodes.
+FETCH_NODE_VERSION_STEP_ELEMENTS = YAML().load(FETCH_NODE_VERSION_STEP)
 
 class GithubNodeReleaseWorkflowModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, release_workflow_file_path):
         super().__init__(release_workflow_file_path)
 
-    def _does_nvmrc_exists(self):
-        target_file = Path(self.file_path).resolve().parents[2]
-        target_file = str(target_file) + '/.nvmrc'
-        return exists(target_file)
+    @cached_property
+    def _nvmrc_exists(self):
+        # Checked once per workflow file, however many setup-node steps it has.
+        return (Path(self.file_path).resolve().parents[2] / '.nvmrc').exists()
 
     def _add_setup_nodejs_env_step(self, step_elements, step_index):
-        if self._does_nvmrc_exists():
-            yaml = YAML()
-            fetch_node_version_step = yaml.load(FETCH_NODE_VERSION_STEP)
+        if self._nvmrc_exists:
             step_elements.insert(
-                step_index, fetch_node_version_step)
+                step_index, deepcopy(FETCH_NODE_VERSION_STEP_ELEMENTS))
+            self._dirty = True
         return step_elements
 
     def _update_node_version(self, step_elements, step_index):
-        if self._does_nvmrc_exists():
-            step_elements[step_index]['with']['node-version'] = "${{ env.NODE_VER }}"
-        else:
-            step_elements[step_index]['with']['node-version'] = 16
+        node_version = "${{ env.NODE_VER }}" if self._nvmrc_exists else 16
+        if step_elements[step_index]['with'].get('node-version') != node_version:
+            step_elements[step_index]['with']['node-version'] = node_version
+            self._dirty = True
         return step_elements
 
     def _update_job_steps(self, job_name, job):
         steps = job.get('steps')
-        updated_job_steps = None
         if not steps:
             return
-        for step in steps:
-            if 'uses' in step and step['uses'] in NODE_JS_SETUP_ACTION_LIST:
-                step_index = self.elements['jobs'][job_name]['steps'].index(step)
-                job_steps = deepcopy(self.elements['jobs'][job_name]['steps'])
-                job_steps = self._update_node_version(job_steps, step_index)
-                job_steps = self._add_setup_nodejs_env_step(job_steps, step_index)
-
-                updated_job_steps = job_steps
-        return updated_job_steps
+        setup_node_step_indexes = [
+            step_index for step_index, step in enumerate(steps)
+            if 'uses' in step and step['uses'] in NODE_JS_SETUP_ACTION_LIST
+        ]
+        # The steps are updated in place; go from the last one back so that
+        # inserting the env step doesn't shift the ones still to be handled.
+        for step_index in reversed(setup_node_step_indexes):
+            self._update_node_version(steps, step_index)
+            self._add_setup_nodejs_env_step(steps, step_index)
 
 
     def _update_job(self):
         jobs = self.elements.get('jobs')
         if 'release' in jobs:
-            updated_job = self._update_job_steps(
-                'release', self.elements['jobs']['release'])
-            self.elements['jobs']['release']['steps'] = updated_job
+            self._update_job_steps('release', self.elements['jobs']['release'])
 
     def modernize(self):
         self._update_job()
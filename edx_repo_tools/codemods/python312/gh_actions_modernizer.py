@@ -2,69 +2,78 @@
 Github Actions CI Modernizer to add Python 3.12 and drop Django 3.2 testing
 """
 import os
-from copy import deepcopy
 import click
 from edx_repo_tools.utils import YamlLoader
 
 TO_BE_REMOVED_PYTHON = ['3.5', '3.6', '3.7']
+TO_BE_REMOVED_PYTHON_SET = frozenset(TO_BE_REMOVED_PYTHON)
 ALLOWED_PYTHON_VERSIONS = ['3.8', '3.12']
 
 ALLOWED_DJANGO_VERSIONS = ['4.2', 'django42']
+ALLOWED_DJANGO_VERSIONS_SET = frozenset(ALLOWED_DJANGO_VERSIONS)
 DJANGO_ENV_TO_ADD = ['django42']
 DJANGO_ENV_TO_REMOVE = ['django32', 'django40', 'django41']
+DJANGO_ENV_TO_REMOVE_SET = frozenset(DJANGO_ENV_TO_REMOVE)
 
 
 class GithubCIModernizer(YamlLoader):
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
     def _update_python_and_django_in_matrix(self):
-        django_versions = list()
-        python_versions = list()
-        matrix_elements = dict()
-
-
-        for section_key in self.elements['jobs']:
-            matrix_elements = deepcopy(self.elements['jobs'][section_key]['strategy']['matrix'])
-
-            for key, value in matrix_elements.items():
+        for section in self.elements['jobs'].values():
+            strategy = section.get('strategy')
+            matrix = strategy.get('matrix') if strategy else None
+            if not matrix:
+                # e.g. a deploy job that doesn't run against several versions
+                continue
+
+            # Keys may be deleted from the matrix as we go, so iterate over a snapshot of its items.
+            for key, value in list(matrix.items()):
                 if key == 'django-version':
-                    for dj_version in DJANGO_ENV_TO_ADD:
-                        if dj_version not in value:
-                            value.append(dj_version)
-                    django_versions = list(filter(lambda version: version in ALLOWED_DJANGO_VERSIONS, value))
-                    if django_versions:
-                        self.elements['jobs'][section_key]['strategy']['matrix'][key] = django_versions
+                    versions_to_add = [version for version in DJANGO_ENV_TO_ADD if version not in value]
+                    django_versions = [
+                        version for version in [*value, *versions_to_add] if version in ALLOWED_DJANGO_VERSIONS_SET
+                    ]
+                    if django_versions and django_versions != value:
+                        matrix[key] = django_versions
+                        self._dirty = True
 
                 if key in ['tox', 'toxenv', 'tox-env']:
-                    for dj_env in DJANGO_ENV_TO_ADD:
-                        if dj_env not in value:
-                            value.append(dj_env)
-                    tox_envs = list(filter(lambda version: version not in DJANGO_ENV_TO_REMOVE, value))
-                    if tox_envs:
-                        self.elements['jobs'][section_key]['strategy']['matrix'][key] = tox_envs
+                    envs_to_add = [dj_env for dj_env in DJANGO_ENV_TO_ADD if dj_env not in value]
+                    tox_envs = [
+                        version for version in [*value, *envs_to_add] if version not in DJANGO_ENV_TO_REMOVE_SET
+                    ]
+                    if tox_envs and tox_envs != value:
+                        matrix[key] = tox_envs
+                        self._dirty = True
 
                 if key == 'python-version':
-                    for version in ALLOWED_PYTHON_VERSIONS:
-                        if version not in value:
-                            value.append(version)
-                    python_versions = list(filter(lambda version: version not in TO_BE_REMOVED_PYTHON, value))
-                    if python_versions:
-                        self.elements['jobs'][section_key]['strategy']['matrix'][key] = python_versions
-                    else:
-                        del self.elements['jobs'][section_key]['strategy']['matrix'][key]
+                    versions_to_add = [version for version in ALLOWED_PYTHON_VERSIONS if version not in value]
+                    python_versions = [
+                        version for version in [*value, *versions_to_add] if version not in TO_BE_REMOVED_PYTHON_SET
+                    ]
+                    if not python_versions:
+                        del matrix[key]
+                        self._dirty = True
+                    elif python_versions != value:
+                        matrix[key] = python_versions
+                        self._dirty = True
 
                 elif key in ['include', 'exclude']:
-                    allowed_python_vers = list()
-                    for item in value:
-                        if item['python-version'] not in TO_BE_REMOVED_PYTHON:
-                            allowed_python_vers.append(item)
-
-                    if len(allowed_python_vers):
-                        self.elements['jobs'][section_key]['strategy']['matrix'][key] = allowed_python_vers
-                    else:
-                        del self.elements['jobs'][section_key]['strategy']['matrix'][key]
-    
+                    allowed_python_vers = [
+                        item for item in value if item['python-version'] not in TO_BE_REMOVED_PYTHON_SET
+                    ]
+
+                    if not allowed_python_vers:
+                        del matrix[key]
+                        self._dirty = True
+                    elif len(allowed_python_vers) != len(value):
+                        matrix[key] = allowed_python_vers
+                        self._dirty = True
+
 
     def _update_github_actions(self):
         self._update_python_and_django_in_matrix()
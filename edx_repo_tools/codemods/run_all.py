@@ -0,0 +1,115 @@
+"""
+Run a set of modernizers and codemods over every repository checked out under
+one directory, in a single interpreter, instead of invoking each one's command
+once per repository.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+import click
+
+from edx_repo_tools.codemods import django3, node16, python312
+from edx_repo_tools.codemods.django3.remove_python2_unicode_compatible import run_removal_query
+from edx_repo_tools.codemods.django3.replace_render_to_response import run_replacement_query
+from edx_repo_tools.codemods.django42.github_actions_modernizer_django42 import (
+    GithubCIModernizer as GithubCIDjango42Modernizer,
+)
+from edx_repo_tools.codemods.django42.remove_providing_args_arg import remove_providing_args
+from edx_repo_tools.codemods.django42.tox_moderniser_django42 import ConfigReader as Django42ConfigReader
+
+
+def _run_tox_modernizer(config_reader_class, path):
+    config_reader_class(path).get_modernizer().modernize()
+
+
+def _run_yaml_modernizer(modernizer_class, path):
+    modernizer_class(path).modernize()
+
+
+def _run_setup_file_modernizer(path):
+    django3.SetupFileModernizer(path).update_setup_file()
+
+
+# Keyed by the name of each modernizer's own console script. Each entry is
+# the path it works on, relative to the repository root, and how to run it.
+CODEMODS = {
+    'modernize_tox': ('tox.ini', partial(_run_tox_modernizer, django3.ConfigReader)),
+    'modernize_setup_file': ('setup.py', _run_setup_file_modernizer),
+    'modernize_github_actions': (
+        '.github/workflows/ci.yml', partial(_run_yaml_modernizer, django3.GithubCIModernizer),
+    ),
+    'modernize_github_actions_django': (
+        '.github/workflows/ci.yml', partial(_run_yaml_modernizer, django3.GithubCIDjangoModernizer),
+    ),
+    'modernize_travis': ('.travis.yml', partial(_run_yaml_modernizer, django3.TravisModernizer)),
+    'remove_python2_unicode_compatible': ('.', run_removal_query),
+    'replace_render_to_response': ('.', run_replacement_query),
+    'modernize_tox_django42': ('tox.ini', partial(_run_tox_modernizer, Django42ConfigReader)),
+    'modernize_github_actions_django42': (
+        '.github/workflows/ci.yml', partial(_run_yaml_modernizer, GithubCIDjango42Modernizer),
+    ),
+    'remove_providing_args': ('.', remove_providing_args),
+    'modernize_node_workflow': (
+        '.github/workflows/ci.yml', partial(_run_yaml_modernizer, node16.GithubCiNodeModernizer),
+    ),
+    'modernize_node_release_workflow': (
+        '.github/workflows/release.yml',
+        partial(_run_yaml_modernizer, node16.GithubNodeReleaseWorkflowModernizer),
+    ),
+    'python312_tox_modernizer': ('tox.ini', partial(_run_tox_modernizer, python312.ConfigReader)),
+    'python312_gh_actions_modernizer': (
+        '.github/workflows/ci.yml', partial(_run_yaml_modernizer, python312.GithubCIModernizer),
+    ),
+}
+
+
+def modernize_repo(repo_path, codemods):
+    """
+    Run each of the named ``codemods`` on the repository at ``repo_path``,
+    skipping any whose target file the repository doesn't have.
+    """
+    for codemod in codemods:
+        relative_path, run_codemod = CODEMODS[codemod]
+        path = os.path.join(repo_path, relative_path)
+        if os.path.exists(path):
+            run_codemod(path)
+    return repo_path
+
+
+@click.command()
+@click.option(
+    '--repos-root', default='.',
+    help="Directory containing a checkout of each repository to modernize")
+@click.option(
+    '--codemod', 'codemods', multiple=True, required=True, type=click.Choice(list(CODEMODS)),
+    help="Modernizer to run on each repository, in the order given; may be repeated")
+def main(repos_root, codemods):
+    """
+    Run the chosen modernizers and codemods on every repository under the root directory,
+    one process per CPU, reporting each repository as soon as it is done.
+    HOW_TO_USE: when running as a repo tool, use following syntax to run the command:
+        run_all_codemods --repos-root {path_to_checkouts} --codemod {name} [--codemod {name} ...]
+    """
+    with os.scandir(repos_root) as entries:
+        repo_paths = sorted(entry.path for entry in entries if entry.is_dir() and not entry.name.startswith('.'))
+    failed = []
+    # The codemods that spread files across processes run them in-process
+    # here, since they're already in a worker.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(modernize_repo, repo_path, codemods): repo_path for repo_path in repo_paths}
+        for future in as_completed(futures):
+            repo_path = futures[future]
+            try:
+                future.result()
+            except Exception as exc:
+                failed.append(repo_path)
+                click.echo(f"Failed to modernize {repo_path}: {exc!r}", err=True)
+            else:
+                click.echo(f"Modernized {repo_path}")
+    if failed:
+        raise click.ClickException(f"Failed to modernize: {', '.join(sorted(failed))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,37 +3,76 @@ Collect and report on conventional commit statistics.
 """
 
 import csv
+import datetime
 import fnmatch
 import os
 import os.path
 import re
 import sqlite3
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 import click
 try:
     import dataset
     import matplotlib.pyplot as plt
     import matplotlib.dates
-    import pandas as pd
+    import numpy as np
 except ImportError as err:
     sys.exit(f"Did you install requirements/conventional_commits.txt? {err}")
 
-from edx_repo_tools.utils import change_dir, get_cmd_output
+from edx_repo_tools.utils import change_dir
+
+
+# How many bytes of git log output to read at a time.
+READ_SIZE = 64 * 1024
+
+# How many commit rows to write to the database in each INSERT.
+INSERT_CHUNK_SIZE = 1000
+
+# collect only appends to a throwaway stats database, so trade some crash
+# safety for fewer fsyncs and a bigger page cache.
+SQLITE_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+]
 
 
 @click.group(help=__doc__)
 def main():
     pass
 
-def load_commits(db, repo_name):
-    """Load the commits from the current directory repo."""
+def git_log_records(gitlog):
+    """
+    Run the `gitlog` command, which must use -z, and yield the text of each
+    NUL-separated record while git is still producing the rest.
+    """
+    # stderr is dropped: repos with no commits yet just produce no records.
+    with subprocess.Popen(gitlog, shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        pending = b""
+        while chunk := proc.stdout.read(READ_SIZE):
+            *records, pending = (pending + chunk).split(b"\0")
+            for record in records:
+                yield decode_record(record)
+        yield decode_record(pending)
+
+def decode_record(record):
+    """Decode a git log record as UTF-8, or as Latin-1 if it isn't UTF-8."""
+    try:
+        return record.decode("utf-8")
+    except UnicodeDecodeError:
+        return record.decode("latin1")
+
+def load_commits(repo):
+    """Return a list of rows for the commits in the `repo` directory."""
 
-    SEP = "-=:=-=:=-=:=-=:=-=:=-=:=-=:=-"
-    GITLOG = f"git log --no-merges --format='format:date: %aI%nhash: %H%nauth: %aE%nname: %aN%nsubj: %s%n%b%n{SEP}'"
+    GITLOG = "git log --no-merges -z --format='format:date: %aI%nhash: %H%nauth: %aE%nname: %aN%nsubj: %s%n%b'"
     SHORT_LINES = 5
 
-    # -=:=-=:=-=:=-=:=-=:=-=:=-=:=-
+    # Records are separated by NUL bytes, shown here as <NUL>:
+    #
     # date: 2021-07-06T15:51:32-04:00
     # hash: ecd257ae297277ef4e544e44f4e803dfd48f238c
     # auth: JHynes@edx.org
@@ -41,24 +80,17 @@ def load_commits(db, repo_name):
     # subj: feat!: Remove temp certificates mgmt cmd
     # [MICROBA-1311]
     # - Remove temporary management command used to fix records incorrectly created with a default `mode` of "honor".
-    #
-    # -=:=-=:=-=:=-=:=-=:=-=:=-=:=-
-    # date: 2021-07-06T12:48:21-04:00
+    # <NUL>date: 2021-07-06T12:48:21-04:00
     # hash: 384bc6b5147423f9c3208ce5c4afa79e5e0cd040
     # auth: 8483753+crice100@users.noreply.github.com
     # name: Christie Rice
     # subj: fix: Fix cert status (#28097)
     # MICROBA-1372
-    # -=:=-=:=-=:=-=:=-=:=-=:=-=:=-
 
-    with db:
-        commit_table = db["commits"]
-
-        log = get_cmd_output(GITLOG)
-        for commit in log.split(SEP + "\n"):
-            if re.match(r"fatal: your current branch '\w+' does not have any commits yet", commit):
-                # Project-only or uninitialized repos are like this.
-                continue
+    rows = []
+    with change_dir(repo) as repo_dir:
+        repo_name = "/".join(repo_dir.split("/")[-2:])
+        for commit in git_log_records(GITLOG):
             if commit:
                 lines = commit.split("\n", maxsplit=SHORT_LINES)
                 row = {"repo": repo_name}
@@ -67,46 +99,61 @@ def load_commits(db, repo_name):
                     row[key] = val
                 row["body"] = lines[SHORT_LINES].strip()
                 analyze_commit(row)
-                commit_table.insert(row)
+                rows.append(row)
+    return rows
+
+# The subject formats below are verbose-mode patterns with a {prefix} for their
+# group names, so that they can also be combined into SUBJECT, which needs
+# distinct group names for each.
 
 # Strict conformance to OEP-51.
-STRICT = r"""(?x)
-    ^
-    (?P<label>build|chore|docs|feat|fix|perf|refactor|revert|style|test|temp)
+_STRICT_FORMAT = r"""
+    (?P<{prefix}label>build|chore|docs|feat|fix|perf|refactor|revert|style|test|temp)
     (?:\(\w+\))?        # an optional scope is allowed
-    (?P<breaking>!?):\s
-    (?P<subjtext>.+)
-    $
+    (?P<{prefix}breaking>!?):\s
+    (?P<{prefix}subjtext>.+)
     """
 
-# Looser checking of conformance to conventional commits.
-LAX = r"""(?xi) # case-insensitive
-    ^
+# Looser checking of conformance to conventional commits. Meant to be matched
+# case-insensitively.
+_LAX_FORMAT = r"""
     # some labels can be pluralized, since it's hard to remember.
-    (?P<label>build|chores?|docs?|feat|fix|perf|refactor|revert|style|tests?|temp)
+    (?P<{prefix}label>build|chores?|docs?|feat|fix|perf|refactor|revert|style|tests?|temp)
     # an optional scope is allowed
     (?:\(\w+\))?
-    (?P<breaking>!?):\s
-    (?P<subjtext>.+)
-    $
+    (?P<{prefix}breaking>!?):\s
+    (?P<{prefix}subjtext>.+)
     |
     # GitHub revert PR commit syntax
-    ^Revert\s+"(?P<subjtext2>.+)"(?:\s+\(\#\d+\))?$
+    Revert\s+"(?P<{prefix}subjtext2>.+)"(?:\s+\(\#\d+\))?
     """
 
+STRICT = re.compile("(?x) ^(?:" + _STRICT_FORMAT.format(prefix="") + ")$")
+LAX = re.compile("(?xi) ^(?:" + _LAX_FORMAT.format(prefix="") + ")$")
+
+# Classify a subject in one pass: the LAX branch is only tried if the STRICT
+# one doesn't match. Its groups are prefixed with "lax_".
+SUBJECT = re.compile(
+    "(?x) ^(?:"
+    + "(?P<strict>" + _STRICT_FORMAT.format(prefix="") + ")"
+    + "|(?P<lax>(?i:" + _LAX_FORMAT.format(prefix="lax_") + "))"
+    + ")$"
+)
+
 def analyze_commit(row):
     row["conventional"] = row["lax"] = False
-    m = re.search(STRICT, row["subj"])
+    m = SUBJECT.search(row["subj"])
     if m:
-        row["conventional"] = True
-    else:
-        m = re.search(LAX, row["subj"])
-        if m:
+        if m["strict"] is not None:
+            row["conventional"] = True
+            row["label"] = m["label"]
+            row["breaking"] = bool(m["breaking"])
+            row["subjtext"] = m["subjtext"]
+        else:
             row["lax"] = True
-    if m:
-        row["label"] = m["label"]
-        row["breaking"] = bool(m["breaking"])
-        row["subjtext"] = m["subjtext"] or m["subjtext2"] or ""
+            row["label"] = m["lax_label"]
+            row["breaking"] = bool(m["lax_breaking"])
+            row["subjtext"] = m["lax_subjtext"] or m["lax_subjtext2"] or ""
     row["bodylines"] = len(row["body"].splitlines())
 
 
@@ -116,7 +163,8 @@ def analyze_commit(row):
 @click.option("--require", help="A file that must exist to process the repo")
 @click.argument("repos", nargs=-1)
 def collect(dbfile, ignore, require, repos):
-    db = dataset.connect("sqlite:///" + dbfile, sqlite_wal_mode=False)
+    db = dataset.connect("sqlite:///" + dbfile, sqlite_wal_mode=True, on_connect_statements=list(SQLITE_PRAGMAS))
+    repos_to_load = []
     for repo in repos:
         if not os.path.isdir(repo):
             continue
@@ -127,10 +175,16 @@ def collect(dbfile, ignore, require, repos):
             if not os.path.exists(os.path.join(repo, require)):
                 print(f"Skipping {repo}")
                 continue
-        print(repo)
-        with change_dir(repo) as repo_dir:
-            repo_name = "/".join(repo_dir.split("/")[-2:])
-            load_commits(db, repo_name)
+        repos_to_load.append(repo)
+
+    # Reading and parsing the logs is spread across processes, but only this
+    # process writes to the database.
+    commit_table = db["commits"]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for repo, rows in zip(repos_to_load, executor.map(load_commits, repos_to_load)):
+            print(repo)
+            # One multi-row INSERT per chunk is much cheaper than an INSERT per commit.
+            commit_table.insert_many(rows, chunk_size=INSERT_CHUNK_SIZE)
 
     # Write repo->squad mapping to the db.
     with open("edx/repo-health-data/dashboards/dashboard_main.csv") as repos_csv:
@@ -141,6 +195,12 @@ def collect(dbfile, ignore, require, repos):
                 "squad": row["ownership.theme"] + "/" + row["ownership.squad"],
             })
 
+    # Index after loading, so the inserts don't have to maintain them: date for
+    # the plot QUERY, repo for joining commits to squads.
+    if commit_table.exists:
+        commit_table.create_index(["date"], name="idx_commits_date")
+        commit_table.create_index(["repo"], name="idx_commits_repo")
+
 
 QUERY = """\
     select
@@ -160,33 +220,38 @@ QUERY = """\
 
 @main.command(help="Plot the collected statistics")
 def plot():
-    # Read sqlite query results into a pandas DataFrame
+    # Read sqlite query results a row at a time into a list per column
     with sqlite3.connect("commits.db") as con:
-        df = pd.read_sql_query(QUERY, con)
+        cursor = con.execute(QUERY)
+        names = [desc[0] for desc in cursor.description]
+        values = {name: [] for name in names}
+        for row in cursor:
+            for name, value in zip(names, row):
+                values[name].append(value)
 
-    # Make the date nice
-    df["when"] = pd.to_datetime(df["weekend"], format="%Y%m%d")
     # Drop the last row, because it's probably incomplete
-    df = df[:-1]
+    cols = {name: np.array(column[:-1]) for name, column in values.items()}
+    # Make the date nice
+    when = np.array([datetime.datetime.strptime(weekend, "%Y%m%d") for weekend in cols["weekend"]])
 
     fig, ax = plt.subplots()
     fig.set_size_inches(12, 8)
     ax.xaxis.set_major_formatter(matplotlib.dates.DateFormatter('%b'))
 
     lines = []
-    lines.append(ax.plot(df.when, df.total, "*-", label="# Commits", color="gray", linewidth=1)[0])
+    lines.append(ax.plot(when, cols["total"], "*-", label="# Commits", color="gray", linewidth=1)[0])
 
     subplot = ax.twinx()
     subplot.set_ylim(-5, 105)
-    lines.append(subplot.plot(df.when, df.pctcon, label="% Strict", color="green", linewidth=4)[0])
+    lines.append(subplot.plot(when, cols["pctcon"], label="% Strict", color="green", linewidth=4)[0])
 
     # subplot = ax.twinx()
     # subplot.set_ylim(-5, 105)
-    # lines.append(subplot.plot(df.when, df.pctlax, label="% Lax", color="blue", linewidth=4)[0])
+    # lines.append(subplot.plot(when, cols["pctlax"], label="% Lax", color="blue", linewidth=4)[0])
 
     subplot = ax.twinx()
     subplot.set_ylim(-5, 105)
-    lines.append(subplot.plot(df.when, df.pctbod, label="% with bodies", color="blue", linewidth=2)[0])
+    lines.append(subplot.plot(when, cols["pctbod"], label="% with bodies", color="blue", linewidth=2)[0])
 
     plt.legend(lines, [l.get_label() for l in lines], loc="upper left")
     plt.show()
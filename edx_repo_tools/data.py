@@ -1,4 +1,8 @@
+import itertools
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from github3.exceptions import NotFoundError
 import yaml
@@ -7,6 +11,16 @@ import yaml
 logging.basicConfig()
 LOGGER = logging.getLogger(__name__)
 
+# libyaml's loader parses much faster, but PyYAML may be built without it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# How many repos to look for files in at once. Each lookup is a few
+# round-trips to GitHub, so this is bound by network latency, not CPU.
+MAX_CONCURRENT_REPOS = 16
+
+# How many repos to look for files in with each GraphQL request.
+GRAPHQL_BATCH_SIZE = 50
+
 
 def iter_nonforks(hub, orgs):
     """Yield all the non-fork repos in a GitHub organization.
@@ -27,11 +41,119 @@ def iter_nonforks(hub, orgs):
                 yield repo
 
 
+def _load_openedx_yaml(repo, file_name, branch, text):
+    """
+    Return the data parsed from ``text``, the contents of ``file_name`` on
+    ``branch`` of ``repo``, or None if it can't be parsed.
+    """
+    LOGGER.debug("Found %s at %s:%s", file_name, repo.full_name, branch)
+    try:
+        return yaml.load(text, Loader=YAML_LOADER)
+    except Exception:
+        LOGGER.error("Couldn't parse %s from %s:%s, skipping repo", file_name, repo.full_name, branch, exc_info=True)
+        return None
+
+
+def _find_openedx_yaml(repo, file_name, branches):
+    """
+    Return ``(repo, data)`` for the contents of ``file_name`` on the first of
+    ``branches`` that has it, or None if there isn't one or it can't be parsed.
+    """
+    for branch in (branches or [repo.default_branch]):
+        try:
+            contents = repo.file_contents(file_name, ref=branch)
+        except NotFoundError:
+            contents = None
+
+        if contents is not None:
+            data = _load_openedx_yaml(repo, file_name, branch, contents.decoded)
+            return None if data is None else (repo, data)
+
+    return None
+
+
+def _graphql(hub, query):
+    """
+    Run the GraphQL ``query`` with ``hub``'s session (so with its auth, retries
+    and throttling), and return the decoded response, or None if it failed.
+    """
+    response = hub.session.post(hub.session.build_url("graphql"), json={"query": query})
+    if not response.ok:
+        LOGGER.warning("GraphQL request failed with status %s", response.status_code)
+        return None
+    return response.json()
+
+
+# Marks a repo that GraphQL couldn't look in, so it has to be looked in with REST.
+_GRAPHQL_FAILED = object()
+
+
+def _graphql_find_openedx_yaml(hub, repos, file_name, branches):
+    """
+    Like :func:`_find_openedx_yaml`, but for all of ``repos`` with a single
+    GraphQL request, instead of a REST request per repo and branch.
+
+    Returns a list with an entry for each of ``repos``, which is
+    ``_GRAPHQL_FAILED`` for any repo that GraphQL reported an error for.
+    """
+    repo_branches = [branches or [repo.default_branch] for repo in repos]
+    fields = []
+    for repo_num, (repo, refs) in enumerate(zip(repos, repo_branches)):
+        owner, name = repo.full_name.split("/", 1)
+        # Like REST with ref=None, a repo without a default branch is looked in at HEAD.
+        expressions = [json.dumps(f"{branch or 'HEAD'}:{file_name}") for branch in refs]
+        objects = " ".join(
+            f"b{branch_num}: object(expression: {expression}) {{ ... on Blob {{ text }} }}"
+            for branch_num, expression in enumerate(expressions)
+        )
+        fields.append(f"r{repo_num}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {objects} }}")
+
+    result = _graphql(hub, "query { " + " ".join(fields) + " }") or {}
+    data = result.get("data") or {}
+    errors = result.get("errors") or []
+    if errors:
+        LOGGER.warning("GraphQL lookup of %s reported errors: %s", file_name, errors)
+    if not data or any(not error.get("path") for error in errors):
+        # The whole request failed, not just some repos.
+        return [_GRAPHQL_FAILED] * len(repos)
+    failed_aliases = {error["path"][0] for error in errors}
+
+    found = []
+    for repo_num, (repo, refs) in enumerate(zip(repos, repo_branches)):
+        alias = f"r{repo_num}"
+        if alias in failed_aliases:
+            found.append(_GRAPHQL_FAILED)
+            continue
+        objects = data.get(alias) or {}
+        for branch_num, branch in enumerate(refs):
+            blob = objects.get(f"b{branch_num}")
+            if blob is not None:
+                # Binary blobs have no text, and can't be parsed anyway.
+                repo_data = _load_openedx_yaml(repo, file_name, branch, blob.get("text") or "")
+                found.append(None if repo_data is None else (repo, repo_data))
+                break
+        else:
+            found.append(None)
+    return found
+
+
+def _batches(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
 def iter_openedx_yaml(file_name, hub, orgs, branches=None):
     """
     Yield the data from all catalog-info.yaml or openedx.yaml files found in repositories in ``orgs``
     on any of ``branches``.
 
+    When ``hub`` is authenticated, files are fetched for many repos at a time
+    with GitHub's GraphQL API. Repos that GraphQL can't look in, and all repos
+    for anonymous hubs (which can't use GraphQL), are looked in with concurrent
+    REST requests instead. Repos are yielded in the order GitHub lists them.
+
     Arguments:
         hub (:class:`~github3.GitHub`): A connection to GitHub.
         orgs (list of str): A GitHub organizations to search for openedx.yaml files.
@@ -44,22 +166,18 @@ def iter_openedx_yaml(file_name, hub, orgs, branches=None):
         Repositories (:class:`~github3.Repository)
 
     """
-    
-    for repo in iter_nonforks(hub, orgs):
-        for branch in (branches or [repo.default_branch]):
-            try:
-                contents = repo.file_contents(file_name, ref=branch)
-            except NotFoundError:
-                contents = None
-
-            if contents is not None:
-                LOGGER.debug("Found %s at %s:%s", file_name, repo.full_name, branch)
-                try:
-                    data = yaml.safe_load(contents.decoded)
-                except Exception as exc:
-                    LOGGER.error("Couldn't parse %s from %s:%s, skipping repo", file_name, repo.full_name, branch, exc_info=True)
-                else:
-                    if data is not None:
-                        yield repo, data
-
-                break
+    find_openedx_yaml = partial(_find_openedx_yaml, file_name=file_name, branches=branches)
+    use_graphql = bool(hub.session.has_auth())
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REPOS) as executor:
+        for repos in _batches(iter_nonforks(hub, orgs), GRAPHQL_BATCH_SIZE):
+            if use_graphql:
+                found = _graphql_find_openedx_yaml(hub, repos, file_name, branches)
+            else:
+                found = [_GRAPHQL_FAILED] * len(repos)
+            failed = [repo for repo, repo_data in zip(repos, found) if repo_data is _GRAPHQL_FAILED]
+            rest_found = executor.map(find_openedx_yaml, failed)
+            for repo_data in found:
+                if repo_data is _GRAPHQL_FAILED:
+                    repo_data = next(rest_found)
+                if repo_data is not None:
+                    yield repo_data
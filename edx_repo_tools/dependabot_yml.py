@@ -1,7 +1,7 @@
 import os
 import click
 
-from edx_repo_tools.utils import YamlLoader
+from edx_repo_tools.utils import YamlLoader, make_yaml_instance
 
 
 github_actions = """\
@@ -25,12 +25,16 @@ class DependabotYamlModernizer(YamlLoader):
     Dependabot Yaml Modernizer class is responsible for adding new elements in dependabot.yml.
     """
 
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path, reviewer):
         super().__init__(file_path)
         self.reviewer = reviewer
 
     def _add_elements(self):
-        self.elements['updates'] = self.elements.get('updates') or []
+        if not self.elements.get('updates'):
+            self.elements['updates'] = []
+            self._dirty = True
         found = False
         for key, value in ADD_NEW_FIELDS:
             for index in self.elements['updates']:
@@ -39,15 +43,19 @@ class DependabotYamlModernizer(YamlLoader):
                     break
         if not found:
             self.elements['updates'].append(self.yml_instance.load(value))
+            self._dirty = True
 
     def _add_reviewers(self):
-        self.elements['updates'] = self.elements.get('updates') or []
+        if not self.elements.get('updates'):
+            self.elements['updates'] = []
+            self._dirty = True
         for key, value in ADD_NEW_FIELDS:
             for index, elem in enumerate(self.elements['updates']):
                 if key == elem.get('package-ecosystem'):
                     self.elements["updates"][index].update(self.yml_instance.load(
                         ecosystem_reviewers.format(**{"reviewer": self.reviewer})
                     ))
+                    self._dirty = True
                     break
 
 
@@ -56,6 +64,7 @@ class DependabotYamlModernizer(YamlLoader):
         self.reviewer and self._add_reviewers()
         # otherwise it brings back whole update back towards left side.
 
+        self.yml_instance = make_yaml_instance()
         self.yml_instance.indent(mapping=4, sequence=4, offset=2)
         self.update_yml_file()
 
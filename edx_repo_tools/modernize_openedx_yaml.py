@@ -11,6 +11,8 @@ class YamlModernizer(YamlLoader):
     update the DEPRECATED_FIELDS list to adjust the modernizer output
     """
 
+    TRACKS_CHANGES = True
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
@@ -18,6 +20,7 @@ class YamlModernizer(YamlLoader):
         for deprecated_field in DEPRECATED_FIELDS:
             if deprecated_field in self.elements.keys():
                 del self.elements[deprecated_field]
+                self._dirty = True
 
     def modernize(self):
         self._remove_deprecated_elements()
@@ -1,6 +1,9 @@
 import contextlib
+import functools
+import multiprocessing
 import os
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 
 import click
 from ruamel.yaml import YAML
@@ -41,24 +44,113 @@ def dry(f, help='Disable or enable actions taken by the script'):
     )(f)
 
 
+def make_yaml_instance():
+    """
+    Return a new round-trip ``YAML`` instance configured the way the
+    modernizers write workflow files.
+    """
+    yml_instance = YAML()
+    yml_instance.preserve_quotes = True
+    yml_instance.default_flow_style = None
+    yml_instance.indent(mapping=2, sequence=2, offset=0)
+    return yml_instance
+
+
+@functools.cache
+def shared_yaml_instance():
+    """
+    Return a ``YAML`` instance from :func:`make_yaml_instance` that is shared
+    by every :class:`YamlLoader`, since setting one up is relatively costly.
+    Don't reconfigure it; use :func:`make_yaml_instance` for a private one.
+    """
+    return make_yaml_instance()
+
+
 class YamlLoader:
+    # Subclasses that set ``_dirty`` whenever they change ``elements`` can set
+    # this, so that a file that is already up to date isn't serialized and
+    # rewritten. Otherwise update_yml_file always writes the file.
+    TRACKS_CHANGES = False
+
     def __init__(self, file_path):
         self.file_path = file_path
-        self.yml_instance = YAML()
-        self.yml_instance.preserve_quotes = True
-        self.yml_instance.default_flow_style = None
-        self.yml_instance.indent(mapping=2, sequence=2, offset=0)
+        self.yml_instance = shared_yaml_instance()
         self._load_file()
 
     def _load_file(self):
         with open(self.file_path) as file_stream:
             self.elements = self.yml_instance.load(file_stream)
+        self._dirty = False
 
     def update_yml_file(self):
+        if self.TRACKS_CHANGES and not self._dirty:
+            return
         with open(self.file_path, 'w') as file_stream:
             self.yml_instance.dump(self.elements, file_stream)
 
 
+# Directories holding VCS data, caches, installed packages or build output
+# rather than project source.
+SKIPPED_DIRECTORIES = frozenset({
+    '.git', '.tox', '.venv', 'venv', 'node_modules', '__pycache__', 'site-packages',
+    'build', 'dist',
+})
+
+
+def iter_files(path, suffix):
+    """
+    Yield ``path`` if it is a file, otherwise every file beneath it whose name
+    ends with ``suffix``, leaving out anything under :data:`SKIPPED_DIRECTORIES`.
+    """
+    if not os.path.isdir(path):
+        yield path
+        return
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIPPED_DIRECTORIES:
+                    yield from iter_files(entry.path, suffix)
+            elif entry.name.endswith(suffix):
+                yield entry.path
+
+
+def iter_python_files(path):
+    """
+    Yield ``path`` if it is a file, otherwise every .py file beneath it.
+    """
+    return iter_files(path, '.py')
+
+
+def files_containing(paths, text):
+    """
+    Yield the paths among ``paths`` whose contents include ``text`` (bytes).
+
+    This is a cheap way to skip files that a codemod would parse but never
+    change.
+    """
+    for path in paths:
+        with open(path, 'rb') as file_stream:
+            if text in file_stream.read():
+                yield path
+
+
+def map_in_processes(func, items, max_workers=None):
+    """
+    Call ``func`` on each of ``items``, spread across ``max_workers`` processes
+    (by default, one per CPU).
+
+    ``func`` must be picklable (i.e. a module-level function). The items are
+    handled in this process instead when there's at most one of them, when
+    ``max_workers`` is 1, or when this is already a worker process, so that
+    nested calls don't start a pool per worker.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers == 1 or multiprocessing.parent_process() is not None:
+        return [func(item) for item in items]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(func, items))
+
+
 def get_cmd_output(cmd):
     """Run a command in shell, and return the Unicode output."""
     try:
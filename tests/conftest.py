@@ -0,0 +1,21 @@
+"""Fixtures shared by the tests"""
+
+import pytest
+
+
+@pytest.fixture
+def make_tree():
+    """
+    Return a function that creates files under a directory.
+
+    ``files`` is either a dict of relative paths to their contents, or just
+    the relative paths, for files whose contents don't matter.
+    """
+    def _make_tree(root, files):
+        if not isinstance(files, dict):
+            files = {relative_path: f"# {relative_path}\n" for relative_path in files}
+        for relative_path, contents in files.items():
+            path = root / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(contents)
+    return _make_tree
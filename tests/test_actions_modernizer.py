@@ -5,6 +5,7 @@ import os
 import shutil
 import uuid
 from unittest import TestCase
+from unittest.mock import patch
 
 from edx_repo_tools.codemods.python312 import GithubCIModernizer
 from edx_repo_tools.utils import YamlLoader
@@ -48,6 +49,23 @@ class TestGithubActionsModernizer(TestCase):
         self.assertIn('3.8', python_versions)
         self.assertIn('3.12', python_versions)
 
+    def test_skips_jobs_without_matrix(self):
+        test_file = self._setup_local_copy("sample_files/sample_ci_file_6.yml")
+        self.addCleanup(os.remove, test_file)
+        ci_elements = TestGithubActionsModernizer._get_updated_yaml_elements(test_file)
+        python_versions = ci_elements['jobs']['run_tests']['strategy']['matrix']['python-version']
+
+        self.assertIn('3.12', python_versions)
+        self.assertNotIn('strategy', ci_elements['jobs']['deploy'])
+
+    def test_up_to_date_file_is_not_rewritten(self):
+        TestGithubActionsModernizer._get_updated_yaml_elements(self.test_file1)
+        modernizer = GithubCIModernizer(self.test_file1)
+        with patch.object(modernizer.yml_instance, 'dump') as dump:
+            modernizer.modernize()
+
+        dump.assert_not_called()
+
     def tearDown(self):
         os.remove(self.test_file1)
         os.remove(self.test_file2)
@@ -66,3 +66,16 @@ def test_add_new_context_processor(tmpdir):
     setting_modernizer.update_context_processors()
     with open(test_file) as test_setting_file:
         assert setting_modernizer.NEW_PROCESSOR in test_setting_file.read()
+
+def test_update_existing_hashing_algorithm_in_place(tmpdir):
+    """
+    Test that an existing hashing algorithm is replaced where it is, rather than duplicated
+    """
+    test_file = setup_local_copy("sample_files/sample_django_settings_2.py", tmpdir)
+    setting_modernizer = SettingsModernizer(setting_path=test_file, is_service=True)
+    setting_modernizer.update_hash_algorithm()
+    with open(test_file) as test_setting_file:
+        lines = test_setting_file.read().splitlines()
+    target_algorithm = f"{setting_modernizer.DEFAULT_ALGORITHM_KEY} = '{setting_modernizer.NEW_HASHING_ALGORITHM}'"
+    assert lines.count(target_algorithm) == 1
+    assert lines.index(target_algorithm) == lines.index(f"{setting_modernizer.DEFAULT_FIELD_KEY} = '{setting_modernizer.NEW_AUTO_FIELD}'") - 1
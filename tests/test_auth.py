@@ -0,0 +1,172 @@
+"""Tests of auth.py"""
+
+import json
+from unittest import mock
+
+import pytest
+import requests
+from github3 import GitHubError
+
+from edx_repo_tools import auth
+
+
+@pytest.fixture(autouse=True)
+def isolated_auth(tmp_path, monkeypatch):
+    """Keep every test away from the real home directory, config files, and cached logins."""
+    config_dir = tmp_path / "config"
+    monkeypatch.setattr(auth, "_config_paths", lambda: (
+        str(config_dir),
+        str(config_dir / "auth.json"),
+        str(config_dir / "auth.yaml"),
+    ))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(auth, "_HUBS", {})
+    auth._read_auth_settings.cache_clear()
+    auth._read_netrc_authenticator.cache_clear()
+    return config_dir
+
+
+def write_netrc(tmp_path, machine):
+    netrc_file = tmp_path / ".netrc"
+    netrc_file.write_text(f"machine {machine} login someone password sekret\n")
+    netrc_file.chmod(0o600)
+
+
+def test_netrc_without_github_entry_prompts_for_password(tmp_path):
+    write_netrc(tmp_path, "example.com")
+    password_hub = mock.Mock()
+    password_hub.session.hooks = {"response": []}
+    password_hub.authorize.return_value = mock.Mock(token="new-token")
+
+    def fake_login(username=None, password=None, two_factor_callback=None):
+        # Like github3.login, give up without credentials.
+        if username is None or password is None:
+            return None
+        return password_hub
+
+    with mock.patch("github3.login", side_effect=fake_login), \
+         mock.patch("click.prompt", side_effect=["someone", "hunter2"]) as prompt:
+        hub = auth.login_github()
+
+    assert hub is password_hub
+    assert prompt.call_count == 2
+    assert auth._HUBS == {}
+    assert auth._load_auth_settings() == {"username": "someone", "token": "new-token"}
+
+
+def test_existing_authorization_is_replaced():
+    hub = mock.Mock()
+    hub.session.hooks = {"response": []}
+    existing = mock.Mock(note=auth.AUTHORIZATION_NOTE)
+    hub.authorizations.return_value = iter([mock.Mock(note="other"), existing])
+    validation_failed = GitHubError(mock.Mock(status_code=422, json=mock.Mock(return_value={"message": "Validation Failed"})))
+    hub.authorize.side_effect = [validation_failed, mock.Mock(token="new-token")]
+
+    with mock.patch("github3.login", return_value=hub), \
+         mock.patch("click.prompt", side_effect=["someone", "hunter2"]):
+        assert auth.login_github() is hub
+
+    hub.authorizations.assert_called_once_with()
+    existing.delete.assert_called_once_with()
+    assert hub.authorize.call_count == 2
+    assert auth._load_auth_settings() == {"username": "someone", "token": "new-token"}
+
+
+def test_read_tokens_file(tmp_path):
+    tokens_file = tmp_path / "tokens"
+    tokens_file.write_text("one\n\n  two  \n   \nthree")
+    assert auth._read_tokens_file(str(tokens_file)) == ["one", "two", "three"]
+
+
+@pytest.mark.parametrize("contents, round_robin", [("one\ntwo\n", True), ("\none\n\n", False)])
+def test_login_with_tokens_file(tmp_path, contents, round_robin):
+    tokens_file = tmp_path / "tokens"
+    tokens_file.write_text(contents)
+
+    with mock.patch("github3.GitHub.ratelimit_remaining", new_callable=mock.PropertyMock, return_value=5000):
+        hub = auth.login_github(username="someone", tokens_file=str(tokens_file))
+
+    assert isinstance(hub.session.auth, auth.RoundRobinTokenAuth) == round_robin
+    # Pooled tokens are throttled by the auth handler, not by the session.
+    assert (auth._throttle in hub.session.hooks["response"]) != round_robin
+
+
+def fake_response(remaining, reset):
+    return mock.Mock(headers={"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)})
+
+
+def send(token_auth, response):
+    """Authorize a request with ``token_auth``, and return the token it used."""
+    request = requests.Request("GET", "https://api.github.com/user").prepare()
+    token_auth(request)
+    requests.hooks.dispatch_hook("response", request.hooks, response)
+    return request.headers["Authorization"].split()[1]
+
+
+def test_round_robin_tokens_take_turns():
+    token_auth = auth.RoundRobinTokenAuth(["a", "b", "c"])
+    used = [send(token_auth, fake_response(4000, 0)) for _ in range(6)]
+    assert used == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_round_robin_prefers_token_with_most_remaining():
+    token_auth = auth.RoundRobinTokenAuth(["a", "b"])
+    send(token_auth, fake_response(50, 0))
+    send(token_auth, fake_response(4000, 0))
+    # "a" is next in turn, but "b" has more budget left.
+    assert send(token_auth, fake_response(3999, 0)) == "b"
+
+
+def test_round_robin_sleeps_only_when_every_token_is_low():
+    token_auth = auth.RoundRobinTokenAuth(["a", "b"])
+    with mock.patch("time.time", return_value=1000), mock.patch("time.sleep") as sleep:
+        send(token_auth, fake_response(1, 1300))
+        # "b" still has budget, so there's no need to wait for "a".
+        assert send(token_auth, fake_response(1, 1100)) == "b"
+        sleep.assert_not_called()
+
+        # Both are nearly exhausted: wait for whichever resets first.
+        assert send(token_auth, fake_response(4999, 4600)) == "b"
+        sleep.assert_called_once_with(100)
+
+
+def test_session_returns_last_response_when_retries_run_out():
+    session = requests.Session()
+    auth._configure_session(session)
+    retry = session.get_adapter("https://api.github.com").max_retries
+    assert 503 in retry.status_forcelist
+    assert not retry.raise_on_status
+
+
+def test_load_auth_settings(isolated_auth):
+    isolated_auth.mkdir()
+    (isolated_auth / "auth.json").write_text('{"username": "someone", "token": "abc"}')
+    assert auth._load_auth_settings() == {"username": "someone", "token": "abc"}
+
+
+def test_load_auth_settings_migrates_legacy_yaml(isolated_auth):
+    isolated_auth.mkdir()
+    (isolated_auth / "auth.yaml").write_text("username: someone\ntoken: abc\n")
+
+    assert auth._load_auth_settings() == {"username": "someone", "token": "abc"}
+    assert json.loads((isolated_auth / "auth.json").read_text()) == {"username": "someone", "token": "abc"}
+    assert not (isolated_auth / "auth.yaml").exists()
+
+
+@pytest.mark.parametrize("file_name, contents", [
+    ("auth.json", '{"username": '),
+    ("auth.yaml", "username: [someone\n"),
+])
+def test_load_corrupt_auth_settings(isolated_auth, file_name, contents):
+    isolated_auth.mkdir()
+    (isolated_auth / file_name).write_text(contents)
+    assert auth._load_auth_settings() == {}
+    # A file that couldn't be read is left alone.
+    assert (isolated_auth / file_name).read_text() == contents
+
+
+def test_write_auth_settings_leaves_no_temporary_files(isolated_auth):
+    auth._write_auth_settings({"username": "someone", "token": "abc"})
+    auth._write_auth_settings({"username": "someone", "token": "def"})
+    assert [path.name for path in isolated_auth.iterdir()] == ["auth.json"]
+    assert auth._load_auth_settings() == {"username": "someone", "token": "def"}
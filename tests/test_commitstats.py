@@ -0,0 +1,82 @@
+"""Tests of conventional_commits/commitstats.py"""
+
+import pytest
+
+# The conventional_commits extra requirements aren't installed everywhere.
+for module_name in ("dataset", "matplotlib", "numpy"):
+    pytest.importorskip(module_name)
+
+from edx_repo_tools.conventional_commits.commitstats import LAX, STRICT, analyze_commit, git_log_records  # pylint: disable=wrong-import-position
+
+
+def analyzed(subj, body=""):
+    row = {"subj": subj, "body": body}
+    analyze_commit(row)
+    return row
+
+
+@pytest.mark.parametrize("subj, label, breaking, subjtext", [
+    ("feat: add a thing", "feat", False, "add a thing"),
+    ("fix(lms): stop crashing", "fix", False, "stop crashing"),
+    ("refactor!: drop Python 3.8", "refactor", True, "drop Python 3.8"),
+    ("temp: try something", "temp", False, "try something"),
+])
+def test_strict_subjects(subj, label, breaking, subjtext):
+    row = analyzed(subj)
+    assert (row["conventional"], row["lax"]) == (True, False)
+    assert (row["label"], row["breaking"], row["subjtext"]) == (label, breaking, subjtext)
+
+
+@pytest.mark.parametrize("subj, label, breaking, subjtext", [
+    ("Feat: add a thing", "Feat", False, "add a thing"),
+    ("chores: tidy up", "chores", False, "tidy up"),
+    ("Tests(api)!: rewrite them", "Tests", True, "rewrite them"),
+])
+def test_lax_subjects(subj, label, breaking, subjtext):
+    row = analyzed(subj)
+    assert (row["conventional"], row["lax"]) == (False, True)
+    assert (row["label"], row["breaking"], row["subjtext"]) == (label, breaking, subjtext)
+
+
+@pytest.mark.parametrize("subj", [
+    'Revert "feat: add a thing"',
+    'Revert "feat: add a thing" (#1234)',
+    'revert  "feat: add a thing"',
+])
+def test_revert_subjects(subj):
+    row = analyzed(subj)
+    assert (row["conventional"], row["lax"]) == (False, True)
+    assert (row["label"], row["breaking"], row["subjtext"]) == (None, False, "feat: add a thing")
+
+
+@pytest.mark.parametrize("subj", [
+    "Add a thing",
+    "feat:add a thing",
+    "feature: add a thing",
+    "fix(two words): nope",
+    'Revert "feat: add a thing" (#abc)',
+])
+def test_non_conventional_subjects(subj):
+    row = analyzed(subj)
+    assert (row["conventional"], row["lax"]) == (False, False)
+    assert "label" not in row
+
+
+def test_body_lines():
+    assert analyzed("feat: x")["bodylines"] == 0
+    assert analyzed("feat: x", "one\n\nthree")["bodylines"] == 3
+
+
+def test_strict_and_lax_patterns():
+    assert STRICT.search("feat!: x").group("label", "breaking", "subjtext") == ("feat", "!", "x")
+    assert STRICT.search("Feat: x") is None
+    assert LAX.search("Feat: x").group("label", "subjtext") == ("Feat", "x")
+    assert LAX.search('Revert "feat: x" (#1)')["subjtext2"] == "feat: x"
+    assert LAX.search("say feat: x") is None
+
+
+def test_git_log_records_decoding():
+    # Each record is decoded on its own: a commit in a legacy encoding doesn't
+    # spoil the UTF-8 ones, and its text is kept rather than replaced.
+    records = git_log_records(r"printf 'name: Andr\303\251\000name: Andr\351\000name: \344\270\255'")
+    assert list(records) == ["name: Andr\u00e9", "name: Andr\u00e9", "name: \u4e2d"]
@@ -0,0 +1,118 @@
+"""Tests of data.py"""
+
+import re
+from unittest.mock import Mock
+
+import pytest
+from github3.exceptions import NotFoundError
+
+from edx_repo_tools import data
+
+
+class FakeRepo:
+    """A stand-in for a github3 Repository, with ``files`` keyed by (file name, branch)."""
+    fork = False
+
+    def __init__(self, name, files, default_branch="main"):
+        self.full_name = f"org/{name}"
+        self.files = files
+        self.default_branch = default_branch
+        self.file_contents = Mock(side_effect=self._file_contents)
+
+    def _file_contents(self, file_name, ref):
+        if (file_name, ref) not in self.files:
+            raise NotFoundError(Mock(status_code=404))
+        return Mock(decoded=self.files[(file_name, ref)].encode())
+
+
+def graphql_data(query, repos):
+    """Answer a GraphQL query built by _graphql_find_openedx_yaml from ``repos``' files."""
+    repos_by_name = {repo.full_name: repo for repo in repos}
+    result = {}
+    for alias, owner, name, objects in re.findall(
+        r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{(.*?)\} \}(?= r\d+:| \}$)', query,
+    ):
+        files = repos_by_name[f"{owner}/{name}"].files
+        result[alias] = {
+            branch_alias: {"text": files[(file_name, branch)]} if (file_name, branch) in files else None
+            for branch_alias, branch, file_name in re.findall(r'(b\d+): object\(expression: "([^:"]+):([^"]+)"\)', objects)
+        }
+    return result
+
+
+def make_hub(repos, authenticated=True, errors=None, ok=True):
+    hub = Mock()
+    hub.organization.return_value.repositories.return_value = repos
+    hub.session.has_auth.return_value = authenticated
+    hub.session.build_url.return_value = "https://api.github.com/graphql"
+
+    def post(url, json):
+        response = Mock(ok=ok, status_code=200 if ok else 502)
+        response.json.return_value = {"data": graphql_data(json["query"], repos), "errors": errors}
+        return response
+
+    hub.session.post.side_effect = post
+    return hub
+
+
+def found_names(hub, branches=None):
+    return [
+        (repo.full_name, repo_data)
+        for repo, repo_data in data.iter_openedx_yaml("openedx.yaml", hub, ["org"], branches)
+    ]
+
+
+@pytest.fixture
+def repos():
+    return [
+        FakeRepo(f"repo{num}", {("openedx.yaml", "main"): f"num: {num}"} if num % 2 else {})
+        for num in range(120)
+    ]
+
+
+def test_graphql_batches(repos):
+    hub = make_hub(repos)
+    found = found_names(hub)
+    assert found == [(f"org/repo{num}", {"num": num}) for num in range(1, 120, 2)]
+    assert hub.session.post.call_count == 3
+    assert not any(repo.file_contents.called for repo in repos)
+
+
+@pytest.mark.parametrize("authenticated", [True, False])
+def test_first_branch_wins(authenticated):
+    repos = [
+        FakeRepo("both", {("openedx.yaml", "main"): "branch: main", ("openedx.yaml", "dev"): "branch: dev"}),
+        FakeRepo("dev-only", {("openedx.yaml", "dev"): "branch: dev"}),
+        FakeRepo("broken", {("openedx.yaml", "main"): "branch: [main", ("openedx.yaml", "dev"): "branch: dev"}),
+        FakeRepo("neither", {}),
+    ]
+    hub = make_hub(repos, authenticated=authenticated)
+    assert found_names(hub, ["main", "dev"]) == [
+        ("org/both", {"branch": "main"}),
+        ("org/dev-only", {"branch": "dev"}),
+    ]
+
+
+def test_anonymous_hub_skips_graphql(repos):
+    hub = make_hub(repos, authenticated=False)
+    assert len(found_names(hub)) == 60
+    hub.session.post.assert_not_called()
+
+
+def test_failed_repos_fall_back_to_rest(repos):
+    hub = make_hub(repos[:4], errors=[{"type": "NOT_FOUND", "path": ["r1"], "message": "Could not resolve"}])
+    assert found_names(hub) == [("org/repo1", {"num": 1}), ("org/repo3", {"num": 3})]
+    assert [repo.file_contents.called for repo in repos[:4]] == [False, True, False, False]
+
+
+def test_failed_request_falls_back_to_rest(repos):
+    hub = make_hub(repos[:4], ok=False)
+    assert found_names(hub) == [("org/repo1", {"num": 1}), ("org/repo3", {"num": 3})]
+    assert all(repo.file_contents.called for repo in repos[:4])
+
+
+def test_repo_without_default_branch_uses_head():
+    repos = [FakeRepo("no-default", {("openedx.yaml", "HEAD"): "branch: HEAD"}, default_branch=None)]
+    hub = make_hub(repos)
+    assert found_names(hub) == [("org/no-default", {"branch": "HEAD"})]
+    assert not repos[0].file_contents.called
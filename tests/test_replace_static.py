@@ -0,0 +1,39 @@
+"""Tests for the replace_static codemod"""
+from click.testing import CliRunner
+
+from edx_repo_tools.codemods.django3.replace_static import main
+
+TEMPLATES = {
+    "templates/base.html": "{% load staticfiles %}\n<link href=\"{% static 'a.css' %}\">\n",
+    "templates/admin/change.html": "{% load i18n %}\n{% load admin_static %}\n{% load staticfiles %}\n",
+    "templates/plain.html": "<p>{% load static %}</p>\n",
+    "templates/notes.txt": "{% load staticfiles %}\n",
+    "node_modules/pkg/index.html": "{% load staticfiles %}\n",
+}
+
+
+def test_replace_static(tmp_path, make_tree):
+    make_tree(tmp_path, TEMPLATES)
+
+    result = CliRunner().invoke(main, ["--path", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert (tmp_path / "templates/base.html").read_text() == (
+        "{% load static %}\n<link href=\"{% static 'a.css' %}\">\n"
+    )
+    assert (tmp_path / "templates/admin/change.html").read_text() == (
+        "{% load i18n %}\n{% load static %}\n{% load static %}\n"
+    )
+    # Unchanged, not HTML, or in a skipped directory.
+    for relative_path in ["templates/plain.html", "templates/notes.txt", "node_modules/pkg/index.html"]:
+        assert (tmp_path / relative_path).read_text() == TEMPLATES[relative_path]
+    assert sorted(result.output.splitlines()) == [
+        f"Replacing in {tmp_path / 'templates/admin/change.html'}",
+        f"Replacing in {tmp_path / 'templates/base.html'}",
+    ]
+
+
+def test_replace_static_requires_path():
+    result = CliRunner().invoke(main, [])
+    assert result.exit_code != 0
+    assert "--path" in result.output
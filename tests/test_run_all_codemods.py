@@ -0,0 +1,87 @@
+"""Tests for the run_all_codemods command"""
+import os
+import shutil
+
+from click.testing import CliRunner
+
+from edx_repo_tools.codemods import django3
+from edx_repo_tools.codemods.django3.remove_python2_unicode_compatible import run_removal_query
+from edx_repo_tools.codemods.django3.replace_render_to_response import run_replacement_query
+from edx_repo_tools.codemods.run_all import main
+
+TESTS_DIR = os.path.dirname(__file__)
+
+# Where each sample file goes in the sample repo.
+SAMPLE_REPO_FILES = {
+    "sample_tox_config.ini": "tox.ini",
+    "test_travis.yml": ".travis.yml",
+    "sample_files/sample_python2_unicode_removal.py": "app/models.py",
+    "sample_files/sample_render_to_response.py": "app/views.py",
+}
+
+
+def make_sample_repo(repo_path):
+    for sample_file, relative_path in SAMPLE_REPO_FILES.items():
+        path = os.path.join(repo_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy2(os.path.join(TESTS_DIR, sample_file), path)
+
+
+def read_repo(repo_path):
+    contents = {}
+    for relative_path in SAMPLE_REPO_FILES.values():
+        with open(os.path.join(repo_path, relative_path)) as repo_file:
+            contents[relative_path] = repo_file.read()
+    return contents
+
+
+def test_run_all_codemods(tmp_path):
+    repos_root = tmp_path / "repos"
+    make_sample_repo(repos_root / "sample")
+    # A repo with none of the files the codemods work on is left alone.
+    (repos_root / "empty").mkdir()
+
+    # The same codemods, run one at a time on another copy.
+    expected_repo = str(tmp_path / "expected")
+    make_sample_repo(expected_repo)
+    django3.ConfigReader(os.path.join(expected_repo, "tox.ini")).get_modernizer().modernize()
+    django3.TravisModernizer(os.path.join(expected_repo, ".travis.yml")).modernize()
+    run_removal_query(expected_repo)
+    run_replacement_query(expected_repo)
+
+    result = CliRunner().invoke(main, [
+        "--repos-root", str(repos_root),
+        "--codemod", "modernize_tox",
+        "--codemod", "modernize_travis",
+        "--codemod", "remove_python2_unicode_compatible",
+        "--codemod", "replace_render_to_response",
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert f"Modernized {repos_root / 'sample'}" in result.output
+    assert f"Modernized {repos_root / 'empty'}" in result.output
+    sample = read_repo(repos_root / "sample")
+    assert sample == read_repo(expected_repo)
+    assert "python_2_unicode_compatible" not in sample["app/models.py"]
+    assert "render_to_response" not in sample["app/views.py"]
+    with open(os.path.join(TESTS_DIR, "sample_tox_config.ini")) as original_tox:
+        assert sample["tox.ini"] != original_tox.read()
+    assert os.listdir(repos_root / "empty") == []
+
+
+def test_run_all_codemods_reports_failed_repos(tmp_path):
+    make_sample_repo(tmp_path / "good")
+    make_sample_repo(tmp_path / "bad")
+    (tmp_path / "bad" / ".travis.yml").write_text("language: [python\n")
+
+    result = CliRunner(mix_stderr=False).invoke(main, [
+        "--repos-root", str(tmp_path), "--codemod", "modernize_tox", "--codemod", "modernize_travis",
+    ])
+
+    assert result.exit_code == 1
+    # The other repos are still modernized, and reported.
+    assert result.stdout == f"Modernized {tmp_path / 'good'}\n"
+    assert f"Failed to modernize {tmp_path / 'bad'}: " in result.stderr
+    assert f"Error: Failed to modernize: {tmp_path / 'bad'}" in result.stderr
+    with open(os.path.join(TESTS_DIR, "test_travis.yml")) as original_travis:
+        assert (tmp_path / "good" / ".travis.yml").read_text() != original_travis.read()
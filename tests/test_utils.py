@@ -0,0 +1,96 @@
+"""Tests of utils.py"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from edx_repo_tools.utils import (
+    SKIPPED_DIRECTORIES, YamlLoader, files_containing, iter_files, iter_python_files, map_in_processes,
+)
+
+
+def test_update_yml_file_writes_untracked_changes(tmp_path):
+    yml_file = tmp_path / "sample.yml"
+    yml_file.write_text("name: old\n")
+
+    loader = YamlLoader(str(yml_file))
+    loader.elements["name"] = "new"
+    loader.update_yml_file()
+
+    assert yml_file.read_text() == "name: new\n"
+
+
+def test_update_yml_file_skips_unchanged_files_when_tracking(tmp_path):
+    class TrackingLoader(YamlLoader):
+        TRACKS_CHANGES = True
+
+    yml_file = tmp_path / "sample.yml"
+    yml_file.write_text("name: old\n")
+
+    loader = TrackingLoader(str(yml_file))
+    with mock.patch.object(loader.yml_instance, "dump") as dump:
+        loader.update_yml_file()
+    dump.assert_not_called()
+
+    loader.elements["name"] = "new"
+    loader._dirty = True
+    loader.update_yml_file()
+    assert yml_file.read_text() == "name: new\n"
+
+
+def relative_paths(root, paths):
+    return sorted(os.path.relpath(path, root) for path in paths)
+
+
+def test_iter_files_skips_directories(tmp_path, make_tree):
+    make_tree(tmp_path, ["setup.py", "pkg/module.py", "pkg/sub/deep.py", "pkg/notes.txt"])
+    make_tree(tmp_path, [f"{name}/skipped.py" for name in SKIPPED_DIRECTORIES])
+    make_tree(tmp_path, ["pkg/node_modules/lib/skipped.py"])
+
+    assert relative_paths(tmp_path, iter_python_files(str(tmp_path))) == [
+        "pkg/module.py", "pkg/sub/deep.py", "setup.py",
+    ]
+
+
+def test_iter_files_filters_by_suffix(tmp_path, make_tree):
+    make_tree(tmp_path, ["a.html", "b.htm", "c.py", "templates/d.html", "templates/html"])
+    assert relative_paths(tmp_path, iter_files(str(tmp_path), ".html")) == ["a.html", "templates/d.html"]
+
+
+def test_iter_files_yields_a_file_path_as_is(tmp_path, make_tree):
+    make_tree(tmp_path, ["notes.txt"])
+    # An explicitly named file is used even if it doesn't have the suffix.
+    assert list(iter_python_files(str(tmp_path / "notes.txt"))) == [str(tmp_path / "notes.txt")]
+
+
+def test_files_containing(tmp_path):
+    (tmp_path / "yes.py").write_bytes(b"from django.utils.encoding import python_2_unicode_compatible\n")
+    (tmp_path / "no.py").write_bytes(b"import python_2\n")
+    (tmp_path / "binary.py").write_bytes(b"\xff\xfe python_2_unicode_compatible")
+    paths = [str(tmp_path / name) for name in ("yes.py", "no.py", "binary.py")]
+
+    assert list(files_containing(paths, b"python_2_unicode_compatible")) == [paths[0], paths[2]]
+
+
+def test_map_in_processes():
+    assert map_in_processes(len, ["a", "bb", "ccc", ""]) == [1, 2, 3, 0]
+    # A single item is handled in this process, so func needn't be picklable.
+    assert map_in_processes(lambda item: item * 2, iter([21])) == [42]
+    assert map_in_processes(len, []) == []
+
+
+def nested_map(item):
+    # Inside a worker, map_in_processes mustn't start a pool of its own.
+    with mock.patch("edx_repo_tools.utils.ProcessPoolExecutor", side_effect=AssertionError):
+        return map_in_processes(len, [item, item * 2])
+
+
+def test_map_in_processes_in_process():
+    with mock.patch("edx_repo_tools.utils.ProcessPoolExecutor", side_effect=AssertionError):
+        assert map_in_processes(lambda item: item * 2, [1, 2, 3], max_workers=1) == [2, 4, 6]
+
+
+def test_map_in_processes_nested():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(nested_map, ["a", "bb"])) == [[1, 2], [2, 4]]
+    assert map_in_processes(nested_map, ["a", "bb"]) == [[1, 2], [2, 4]]